@@ -2,12 +2,18 @@ import gradio as gr
 import math
 import pandas as pd
 import io
-from math import gcd
-from functools import reduce
+from cube_grid import classify_cells, filter_cells, grid_dtype, scale_closure
+from cube_sums import TwoCubeSumFilter
+from cube_families import FAMILY_SEED_BOUND, family_quadruplets
+from cube_kernels import (RANGE_SEARCH_ENGINES, SINGLE_SEARCH_ENGINES, cell_pairs, grid_solutions, primitive_cell_pairs,
+                          range_search_engine, scaled_cell_solutions, search_budget_note, shared_primitive_index,
+                          single_search_engine)
+from cube_math import divisor_search_bounds, feasible_b_window, gcd_of, window_size
+from factorization import divisors_in_range, factorization_cache_info, factorize
 
 def find_gcd_multiple(*numbers):
     """Find GCD of multiple numbers"""
-    return reduce(gcd, numbers)
+    return gcd_of(*numbers)
 
 def is_primitive_solution(a, b, c, d):
     """Check if solution is primitive (gcd = 1)"""
@@ -102,9 +108,13 @@ def export_to_excel(quadruplets, filename="cube_quadruplets_results.xlsx"):
     output.seek(0)
     return output.getvalue()
 
-def find_cube_quadruplets_with_factors(a, n, max_iterations=10000, include_factors=True, max_factor=5):
+def find_cube_quadruplets_with_factors(a, n, max_iterations=10000, include_factors=True, max_factor=5,
+                                       method="auto"):
     """
     ENHANCED: Find cube quadruplets with common factor analysis
+    method: "scan" walks the feasible b window, "vector" evaluates it as NumPy arrays,
+    "divisor" solves for b + c over the divisors of d³ - a³, "jit" runs the Numba-compiled b loop
+    (the scan without Numba), "auto" picks by window width
     """
     try:
         a, n = int(a), int(n)
@@ -125,81 +135,85 @@ def find_cube_quadruplets_with_factors(a, n, max_iterations=10000, include_facto
 • Target: d³ - a³ = {target_sum:,}
 • Include factor analysis: {'Yes' if include_factors else 'No'}
 • Max factor to check: {max_factor if include_factors else 'N/A'}
-{'='*70}
 """
     
+    # Only b with b³ > target/2 (so c < b) and b³ < target (so c > 0) can work
+    b_low, b_high = feasible_b_window(a, target_sum)
+    feasible_count = window_size(b_low, b_high)
+    result_text += f"• Feasible b window: {f'{b_low} to {b_high} ({feasible_count:,} values)' if feasible_count else 'empty'}\n"
+    
+    engine = single_search_engine(method, feasible_count, target_sum)
+    result_text += f"• Engine: {SINGLE_SEARCH_ENGINES[engine]}\n"
+
+    # Scaled solutions come from the known primitives of (a/k, n/k), k | gcd(a, n); the
+    # search then only hunts primitives
+    common = math.gcd(a, n)
+    primitive_index = shared_primitive_index()
+    scaled = scaled_cell_solutions(a, n, primitive_index) if feasible_count else None
+    coprime_to = common if scaled is not None else 1
+    if common > 1 and scaled is not None:
+        result_text += f"• Scaled solutions from known primitives of (a/k, n/k), k | {common}: {len(scaled)}\n"
+    result_text += f"{'='*70}\n"
+    
     quadruplets = []
     primitive_solutions = []
     factor_families = {}
     search_details = ""
-    iterations = 0
+    budget_note = ""
     
-    # Search for solutions
-    max_b = a - 1
+    found_pairs, iterations, covered = cell_pairs(a, n, engine, max_iterations, coprime_to)
+    if engine == "divisor":
+        s_low, s_high = divisor_search_bounds(target_sum)
+        search_details += f"🧩 Checked {iterations:,} divisor(s) of d³ - a³ between {s_low:,} and {s_high:,}\n"
+    elif covered < feasible_count:
+        budget_note = search_budget_note(max_iterations, covered, feasible_count)
+
+    if covered == feasible_count:
+        primitive_index.record(a, n, [(a, b, c, d) for b, c in found_pairs if 0 < c < b and math.gcd(b, common) == 1])
+    if scaled:
+        found_pairs = sorted(found_pairs + [(b, c) for _, b, c, _ in scaled], key=lambda pair: -pair[0])
     
-    for b in range(max_b, 0, -1):
-        iterations += 1
-        
-        if iterations % 1000 == 0:
-            search_details += f"🔄 Searched {iterations} iterations... (current b = {b})\n"
-        
-        if iterations > max_iterations:
-            search_details += f"⚠️ **Search stopped after {max_iterations:,} iterations**\n"
-            break
-        
-        if b >= a or b >= d:
-            continue
+    for b, c in found_pairs:
+        if (c > 0 and c < b and c < a and c < d and 
+            c != a and c != b and c != d):
             
-        b_cubed = b**3
-        c_cubed_needed = target_sum - b_cubed
-        
-        if c_cubed_needed <= 0:
-            continue
-            
-        c_exact = c_cubed_needed**(1/3)
-        c = round(c_exact)
-        
-        if abs(c**3 - c_cubed_needed) < 1e-10:
-            if (c > 0 and c < b and c < a and c < d and 
-                c != a and c != b and c != d):
+            if a**3 + b**3 + c**3 == d**3:
+                quadruplet = (a, b, c, d)
+                quadruplets.append(quadruplet)
                 
-                if abs(a**3 + b**3 + c**3 - d**3) < 1e-10:
-                    quadruplet = (a, b, c, d)
-                    quadruplets.append(quadruplet)
+                # ENHANCED: Analyze common factors
+                if include_factors:
+                    common_factor = find_gcd_multiple(a, b, c, d)
+                    is_primitive = common_factor == 1
                     
-                    # ENHANCED: Analyze common factors
-                    if include_factors:
-                        common_factor = find_gcd_multiple(a, b, c, d)
-                        is_primitive = common_factor == 1
-                        
-                        if is_primitive:
-                            primitive_solutions.append(quadruplet)
-                            primitive_a, primitive_b, primitive_c, primitive_d = a, b, c, d
-                        else:
-                            primitive_a, primitive_b, primitive_c, primitive_d, _ = get_primitive_form(a, b, c, d)
-                        
-                        # Group by primitive form
-                        primitive_key = (primitive_a, primitive_b, primitive_c, primitive_d)
-                        if primitive_key not in factor_families:
-                            factor_families[primitive_key] = []
-                        factor_families[primitive_key].append((quadruplet, common_factor))
+                    if is_primitive:
+                        primitive_solutions.append(quadruplet)
+                        primitive_a, primitive_b, primitive_c, primitive_d = a, b, c, d
+                    else:
+                        primitive_a, primitive_b, primitive_c, primitive_d, _ = get_primitive_form(a, b, c, d)
                     
-                    search_details += f"""
+                    # Group by primitive form
+                    primitive_key = (primitive_a, primitive_b, primitive_c, primitive_d)
+                    if primitive_key not in factor_families:
+                        factor_families[primitive_key] = []
+                    factor_families[primitive_key].append((quadruplet, common_factor))
+                
+                search_details += f"""
 ✅ **FOUND QUADRUPLET #{len(quadruplets)}: ({a}, {b}, {c}, {d})**
 🧮 **Basic verification:**
    • {a}³ + {b}³ + {c}³ = {a**3:,} + {b**3:,} + {c**3:,} = {a**3 + b**3 + c**3:,}
    • {d}³ = {d**3:,} ✓
 """
-                    
-                    # ENHANCED: Add factor analysis
-                    if include_factors:
-                        search_details += f"""🔢 **Factor Analysis:**
+                
+                # ENHANCED: Add factor analysis
+                if include_factors:
+                    search_details += f"""🔢 **Factor Analysis:**
    • Common factor: {common_factor}
    • Type: {'Primitive' if is_primitive else 'Non-primitive'}
    • Primitive form: ({primitive_a}, {primitive_b}, {primitive_c}, {primitive_d})
 """
-                        if not is_primitive:
-                            search_details += f"   • Scaling: {common_factor} × ({primitive_a}, {primitive_b}, {primitive_c}, {primitive_d})\n"
+                    if not is_primitive:
+                        search_details += f"   • Scaling: {common_factor} × ({primitive_a}, {primitive_b}, {primitive_c}, {primitive_d})\n"
     
     # ENHANCED: Generate additional solutions using found primitives
     if include_factors and primitive_solutions:
@@ -230,8 +244,10 @@ def find_cube_quadruplets_with_factors(a, n, max_iterations=10000, include_facto
     # ENHANCED: Summary with factor analysis
     if not quadruplets:
         result_text += f"\n❌ **No cube quadruplets found**\n"
+        result_text += budget_note
     else:
         result_text += search_details
+        result_text += budget_note
         result_text += f"\n🎉 **ENHANCED SUMMARY:**\n"
         result_text += f"• Total quadruplets found: {len(quadruplets)}\n"
         
@@ -249,14 +265,23 @@ def find_cube_quadruplets_with_factors(a, n, max_iterations=10000, include_facto
     return result_text, quadruplets
 
 def find_cube_quadruplets_range_with_factors(a_start, a_end, n_start, n_end, max_iterations_per_combo=5000, 
-                                           focus_on_primitives=True, max_factor=3):
+                                           focus_on_primitives=True, max_factor=3, method="auto", bloom_fpr=0.0):
     """
     ENHANCED: Range search with primitive-first approach
+    method: "index" finds the phase 1 primitives by probing every d³ - a³ of the grid at once
+    against a sorted table of b³ + c³ with b < a_end, "vector" evaluates the grid as
+    broadcast (a, n, b) tiles, "sweep" walks each a row's d³ - a³ upward against the
+    ascending b³ + c³, "diagonal" solves the cells of each d = a + n together,
+    "scan" searches cell by cell, "auto" uses the index when the grid has at least a_end
+    cells and the table stays small
+    bloom_fpr: when > 0 (and cells are scanned one by one), cells whose d³ - a³ a Bloom filter of
+    b³ + c³ rules out are skipped; the filter is sized for this false-positive rate
     """
     try:
         a_start, a_end = int(a_start), int(a_end)
         n_start, n_end = int(n_start), int(n_end)
         max_iterations_per_combo = int(max_iterations_per_combo) if max_iterations_per_combo > 0 else 5000
+        bloom_fpr = float(bloom_fpr) if bloom_fpr and 0 < bloom_fpr < 1 else 0.0
         max_factor = int(max_factor) if max_factor > 0 else 3
     except (ValueError, TypeError):
         return "Error: Please enter valid integers", []
@@ -281,53 +306,93 @@ def find_cube_quadruplets_range_with_factors(a_start, a_end, n_start, n_end, max
     all_quadruplets = []
     primitive_solutions = []
     
+    # Cells that are provably empty are skipped in both search modes
+    must_search = classify_cells(a_start, a_end, n_start, n_end)
+    total_cells = must_search.size
+    cells_pruned = total_cells - int(must_search.sum())
+    cache_before = factorization_cache_info()
+    grid_engine = range_search_engine(method, a_end, n_end, total_cells)
+    cells_filtered = 0
+    if bloom_fpr and not (focus_on_primitives and grid_engine != "scan") and a_end > 2 and grid_dtype(a_end, n_end) is not object:
+        sum_filter = TwoCubeSumFilter(a_end - 1, false_positive_rate=bloom_fpr)
+        cells_filtered = filter_cells(must_search, sum_filter, a_start, a_end, n_start, n_end)
+    
     # ENHANCED: Two-phase search
     if focus_on_primitives:
         result_text += "\n🎯 **PHASE 1: Finding Primitive Solutions**\n"
+        # A grid engine also returns the multiples, including those of primitives outside the grid;
+        # the scan finds those primitives by searching their reduced cells (a/k, n/k) as well
+        grid_multiples = []
+        outside_cells = set()
+        if grid_engine != "scan":
+            # The whole grid is solved up front instead of one search per cell
+            result_text += f"🧮 Solving all cells at once: {RANGE_SEARCH_ENGINES[grid_engine]}\n"
+            cell_solutions = grid_solutions(grid_engine, a_start, a_end, n_start, n_end)
         
         # Phase 1: Search for primitive solutions
         for a in range(a_start, a_end + 1):
             for n in range(n_start, n_end + 1):
-                search_result, found_quadruplets = find_cube_quadruplets_with_factors(
-                    a, n, max_iterations_per_combo, include_factors=True, max_factor=1
-                )
+                if not must_search[a - a_start, n - n_start]:
+                    continue
+                if grid_engine != "scan":
+                    found_quadruplets = cell_solutions.get((a, n), [])
+                else:
+                    # b sharing a factor with gcd(a, n) are never searched; only primitives come back
+                    found_pairs, _ = primitive_cell_pairs(a, n, max_iterations_per_combo)
+                    found_quadruplets = [(a, b, c, a + n) for b, c in found_pairs]
+                    common = math.gcd(a, n)
+                    if common > 1:
+                        outside_cells.update((a // k, n // k) for k in divisors_in_range(factorize(common), 2, common)
+                                             if a // k < a_start or n // k < n_start)
                 
                 for quad in found_quadruplets:
-                    if is_primitive_solution(*quad) and quad not in all_quadruplets:
+                    if not is_primitive_solution(*quad):
+                        grid_multiples.append(quad)
+                    elif quad not in all_quadruplets:
                         all_quadruplets.append(quad)
                         primitive_solutions.append(quad)
                         result_text += f"✅ Primitive: {quad}\n"
         
         result_text += f"\n🏆 **Found {len(primitive_solutions)} primitive solutions**\n"
+        outside_primitives = []
+        for a, n in sorted(outside_cells):
+            found_pairs, _ = primitive_cell_pairs(a, n, max_iterations_per_combo)
+            outside_primitives.extend((a, b, c, a + n) for b, c in found_pairs)
         
         # Phase 2: Generate scaled families
-        if primitive_solutions:
+        # The parametric families add primitives from outside the grid whose multiples land in it
+        family_seeds = [q for q in family_quadruplets(FAMILY_SEED_BOUND, d_max=(a_end + n_end) // 2)
+                        if not (a_start <= q[0] <= a_end and n_start <= q[3] - q[0] <= n_end)]
+        # Every multiple that lands in the grid, not just those up to max_factor
+        closure = scale_closure(primitive_solutions + outside_primitives + family_seeds, a_start, a_end, n_start, n_end)
+        scaled_by_primitive = {}
+        for quad in [scaled_quad for _, scaled_quad in closure] + grid_multiples:
+            *primitive, factor = get_primitive_form(*quad)
+            family = scaled_by_primitive.setdefault(tuple(primitive), [])
+            if (factor, quad) not in family:
+                family.append((factor, quad))
+        
+        if primitive_solutions or scaled_by_primitive:
             result_text += f"\n🚀 **PHASE 2: Generating Scaled Families**\n"
             
-            for primitive in primitive_solutions:
-                prim_a, prim_b, prim_c, prim_d = primitive
-                original_n = prim_d - prim_a
-                
-                result_text += f"\n📊 **Scaling primitive {primitive}:**\n"
-                
-                for factor in range(2, max_factor + 1):
-                    scaled_quad = tuple(factor * x for x in primitive)
+            seeds_used = [primitive for primitive in family_seeds if primitive in scaled_by_primitive]
+            outside = [primitive for primitive in scaled_by_primitive
+                       if primitive not in primitive_solutions and primitive not in seeds_used]
+            for primitive in primitive_solutions + seeds_used + outside:
+                origin = " (parametric family)" if primitive in seeds_used else " (outside the grid)" if primitive in outside else ""
+                result_text += f"\n📊 **Scaling primitive {primitive}{origin}:**\n"
+                for factor, scaled_quad in sorted(scaled_by_primitive.get(primitive, [])):
                     scaled_a, scaled_b, scaled_c, scaled_d = scaled_quad
-                    scaled_n = scaled_d - scaled_a
-                    
-                    # Check if scaled solution is within our search range
-                    if (a_start <= scaled_a <= a_end and 
-                        n_start <= scaled_n <= n_end and 
-                        scaled_quad not in all_quadruplets):
-                        
-                        all_quadruplets.append(scaled_quad)
-                        result_text += f"   • Factor {factor}: {scaled_quad} (a={scaled_a}, n={scaled_n})\n"
+                    all_quadruplets.append(scaled_quad)
+                    result_text += f"   • Factor {factor}: {scaled_quad} (a={scaled_a}, n={scaled_d - scaled_a})\n"
     
     else:
         # Original range search without primitive focus
         result_text += "\n🔍 **STANDARD RANGE SEARCH:**\n"
         for a in range(a_start, a_end + 1):
             for n in range(n_start, n_end + 1):
+                if not must_search[a - a_start, n - n_start]:
+                    continue
                 search_result, found_quadruplets = find_cube_quadruplets_with_factors(
                     a, n, max_iterations_per_combo, include_factors=True, max_factor=max_factor
                 )
@@ -338,6 +403,16 @@ def find_cube_quadruplets_range_with_factors(a_start, a_end, n_start, n_end, max
     result_text += f"🎉 **FINAL SUMMARY:**\n"
     result_text += f"• Total quadruplets found: {len(all_quadruplets)}\n"
     result_text += f"• Primitive solutions: {len(primitive_solutions)}\n"
+    result_text += f"• Cells pruned as provably empty: {cells_pruned:,} of {total_cells:,} "
+    result_text += f"({cells_pruned/total_cells*100:.1f}%)\n"
+    if cells_filtered:
+        result_text += f"• Cells rejected by the b³ + c³ Bloom filter: {cells_filtered:,} "
+        result_text += f"({sum_filter.memory_bytes / 2**20:.1f} MB, {sum_filter.hash_count} hashes, "
+        result_text += f"~{sum_filter.false_positive_rate:.2%} false positives)\n"
+    cache_after = factorization_cache_info()
+    if cache_after.misses > cache_before.misses:
+        result_text += f"• Factorizations computed: {cache_after.misses - cache_before.misses:,}, "
+        result_text += f"reused from cache: {cache_after.hits - cache_before.hits:,}\n"
     
     if all_quadruplets:
         result_text += f"\n🏆 **ALL SOLUTIONS FOUND:**\n"
@@ -383,7 +458,10 @@ def create_improved_interface():
                         n_end_input = gr.Number(label="'n' end value", value=5, precision=0)
                         max_iter_range = gr.Number(label="Max iterations per combination", value=3000, precision=0)
                         focus_primitives = gr.Checkbox(label="Focus on primitives first", value=True)
-                        max_scale_factor = gr.Number(label="Max scaling factor", value=4, precision=0)
+                        max_scale_factor = gr.Number(label="Max scaling factor (standard search only; primitives scale to the grid edge)", value=4, precision=0)
+                        range_method = gr.Radio(choices=["auto", "index", "vector", "sweep", "diagonal", "scan"], value="auto",
+                                                label="Primitive search engine (index: probe all cells against sorted b³ + c³, vector: NumPy (a, n, b) tiles, sweep: ascending b³ + c³ per a, diagonal: cells sharing d together, scan: cell by cell)")
+                        range_bloom_fpr = gr.Number(label="Bloom filter false-positive rate for scans (0 = off)", value=0)
                         enhanced_range_search_btn = gr.Button("🎯 Start Enhanced Range Search", variant="primary")
                     
                     with gr.Column():
@@ -459,7 +537,7 @@ def create_improved_interface():
                 enhanced_range_search_btn.click(
                     find_cube_quadruplets_range_with_factors,
                     inputs=[a_start_input, a_end_input, n_start_input, n_end_input, 
-                           max_iter_range, focus_primitives, max_scale_factor],
+                           max_iter_range, focus_primitives, max_scale_factor, range_method, range_bloom_fpr],
                     outputs=[enhanced_range_output, enhanced_quadruplets_state]
                 ).then(
                     update_results_table,
@@ -485,6 +563,8 @@ def create_improved_interface():
                         a_input = gr.Number(label="Value of 'a' (positive integer)", value=6, precision=0)
                         n_input = gr.Number(label="Value of 'n' (positive integer)", value=3, precision=0)
                         max_iter = gr.Number(label="Max iterations", value=20000, precision=0)
+                        search_method = gr.Radio(choices=["auto", "divisor", "jit", "vector", "scan"], value="auto",
+                                                 label="Search engine (divisor: factor d³ - a³, jit: compiled b loop if Numba is installed, vector: NumPy b window, scan: walk b)")
                         include_factors = gr.Checkbox(label="Include factor analysis", value=True)
                         max_factor = gr.Number(label="Max factor for scaling", value=5, precision=0)
                         enhanced_search_btn = gr.Button("🚀 Start Enhanced Search", variant="primary")
@@ -496,7 +576,7 @@ def create_improved_interface():
                 
                 enhanced_search_btn.click(
                     find_cube_quadruplets_with_factors,
-                    inputs=[a_input, n_input, max_iter, include_factors, max_factor],
+                    inputs=[a_input, n_input, max_iter, include_factors, max_factor, search_method],
                     outputs=[enhanced_search_output, enhanced_single_quadruplets_state]
                 )
             
@@ -1,12 +1,26 @@
 import gradio as gr
 import math
+from itertools import islice
+import numpy as np
+from cube_grid import classify_cells, feasible_window_sizes, filter_cells, grid_dtype
+from cube_sums import INDEX_AUTO_MAX_B, TwoCubeSumFilter, iter_quadruplets, taxicab_cells
+from cube_families import FAMILIES, family_quadruplets
+from power_sums import power_grid_solutions
+from cube_kernels import (RANGE_SEARCH_ENGINES, SINGLE_SEARCH_ENGINES, cell_pairs, grid_solution_counts, grid_solutions,
+                          range_search_engine, scaled_cell_solutions, search_budget_note, shared_primitive_index,
+                          single_search_engine)
+from cube_math import divisor_search_bounds, feasible_b_window, window_size
+from factorization import TargetFactorizationCache, factorization_cache_info
 
 
-def find_cube_quadruplets_improved(a, n, max_iterations=10000):
+def find_cube_quadruplets_improved(a, n, max_iterations=10000, method="auto"):
     """
     Improved cube quadruplets finder with unlimited search capability
     Equation: d³ - a³ = b³ + c³
     Where: d = a + n, and d > a > b > c > 0
+    method: "scan" walks the feasible b window, "vector" evaluates it as NumPy arrays,
+    "divisor" solves for b + c over the divisors of d³ - a³, "jit" runs the Numba-compiled b loop
+    (the scan without Numba), "auto" picks by window width
     """
     try:
         a, n = int(a), int(n)
@@ -28,58 +42,58 @@ def find_cube_quadruplets_improved(a, n, max_iterations=10000):
 • Target: d³ - a³ = {d}³ - {a}³ = {target_sum:,}
 • Equation: b³ + c³ = {target_sum:,}
 • Constraint: {d} > {a} > b > c > 0
-{'='*60}
 """
-    
+
+    # Only b with b³ > target/2 (so c < b) and b³ < target (so c > 0) can work
+    b_low, b_high = feasible_b_window(a, target_sum)
+    feasible_count = window_size(b_low, b_high)
+    if feasible_count:
+        result_text += f"• Feasible b window: {b_low} to {b_high} ({feasible_count:,} values)\n"
+    else:
+        result_text += f"• Feasible b window: empty (no b < {a} can satisfy the equation)\n"
+
+    engine = single_search_engine(method, feasible_count, target_sum)
+    result_text += f"• Engine: {SINGLE_SEARCH_ENGINES[engine]}\n"
+
+    # Once the primitives of every (a/k, n/k), k | gcd(a, n), are known, the scaled solutions
+    # are looked up and the b search only hunts primitives: b sharing a factor with gcd(a, n) is skipped
+    common = math.gcd(a, n)
+    primitive_index = shared_primitive_index()
+    scaled = scaled_cell_solutions(a, n, primitive_index) if feasible_count else None
+    coprime_to = common if scaled is not None else 1
+    if common > 1 and scaled is not None:
+        result_text += f"• Scaled solutions from known primitives of (a/k, n/k), k | {common}: {len(scaled)}\n"
+    result_text += f"{'='*60}\n"
+
     quadruplets = []
     search_details = ""
-    iterations = 0
-    
-    # Unlimited search - we'll search until we find solutions or hit iteration limit
-    # Start from b = a-1 and work downwards
-    max_b = a - 1
-    
-    for b in range(max_b, 0, -1):
-        iterations += 1
-        
-        # Progress indicator for long searches
-        if iterations % 1000 == 0:
-            search_details += f"🔄 Searched {iterations} iterations... (current b = {b})\n"
-        
-        # Stop if we've hit the iteration limit (to prevent infinite loops in UI)
-        if iterations > max_iterations:
-            search_details += f"⚠️ **Search stopped after {max_iterations:,} iterations**\n"
-            search_details += f"📈 **To continue search, increase max_iterations parameter**\n\n"
-            break
-        
-        if b >= a or b >= d:  # Ensure b < a and b < d
-            continue
-            
-        b_cubed = b**3
-        
-        # Calculate required c³ from equation: c³ = d³ - a³ - b³
-        c_cubed_needed = target_sum - b_cubed
-        
-        # Skip if c³ would be non-positive
-        if c_cubed_needed <= 0:
-            continue
+    budget_note = ""
+
+    found_pairs, iterations, covered = cell_pairs(a, n, engine, max_iterations, coprime_to)
+    if engine == "divisor":
+        s_low, s_high = divisor_search_bounds(target_sum)
+        search_details += f"🧩 Checked {iterations:,} divisor(s) of d³ - a³ between {s_low:,} and {s_high:,}\n"
+    elif covered < feasible_count:
+        budget_note = search_budget_note(max_iterations, covered, feasible_count)
+        budget_note += f"📈 **To continue search, increase max_iterations parameter**\n\n"
+
+    if covered == feasible_count:
+        primitive_index.record(a, n, [(a, b, c, d) for b, c in found_pairs if 0 < c < b and math.gcd(b, common) == 1])
+    if scaled:
+        found_pairs = sorted(found_pairs + [(b, c) for _, b, c, _ in scaled], key=lambda pair: -pair[0])
+
+    for b, c in found_pairs:
+        # Verify all constraints
+        if (c > 0 and c < b and c < a and c < d and 
+            c != a and c != b and c != d):
             
-        # Calculate c = ∛(d³ - a³ - b³)
-        c_exact = c_cubed_needed**(1/3)
-        c = round(c_exact)
-        
-        # Verify c is a perfect cube root (within floating point precision)
-        if abs(c**3 - c_cubed_needed) < 1e-10:  # Better precision check
-            # Verify all constraints
-            if (c > 0 and c < b and c < a and c < d and 
-                c != a and c != b and c != d):
+            # Final verification of the equation
+            if a**3 + b**3 + c**3 == d**3:
+                quadruplet = (a, b, c, d)
+                quadruplets.append(quadruplet)
+                c_cubed_needed = target_sum - b**3
                 
-                # Final verification of the equation
-                if abs(a**3 + b**3 + c**3 - d**3) < 1e-10:
-                    quadruplet = (a, b, c, d)
-                    quadruplets.append(quadruplet)
-                    
-                    search_details += f"""
+                search_details += f"""
 ✅ **FOUND VALID QUADRUPLET #{len(quadruplets)}: ({a}, {b}, {c}, {d})**
 🧮 **Step-by-step calculation:**
    • d³ - a³ = {d}³ - {a}³ = {d**3:,} - {a**3:,} = {target_sum:,}
@@ -90,7 +104,7 @@ def find_cube_quadruplets_improved(a, n, max_iterations=10000):
 🎯 **Full equation check:**
    • {a}³ + {b}³ + {c}³ = {a**3:,} + {b**3:,} + {c**3:,} = {a**3 + b**3 + c**3:,}
    • {d}³ = {d**3:,}
-   • Match: {"✅" if abs(a**3 + b**3 + c**3 - d**3) < 1e-10 else "❌"}
+   • Match: {"✅" if a**3 + b**3 + c**3 == d**3 else "❌"}
 📏 **Constraint check:** {d} > {a} > {b} > {c} > 0
    • {d} > {a}: {"✅" if d > a else "❌"}
    • {a} > {b}: {"✅" if a > b else "❌"}  
@@ -101,24 +115,51 @@ def find_cube_quadruplets_improved(a, n, max_iterations=10000):
     # Summary
     if not quadruplets:
         result_text += f"\n❌ **No cube quadruplets found**\n"
+        result_text += budget_note
         result_text += f"🔍 **Search completed:** {iterations:,} iterations\n"
-        result_text += f"📊 **Range searched:** b from {max_b} down to 1\n"
+        if feasible_count:
+            result_text += f"📊 **Range searched:** b from {b_high} down to {b_high - covered + 1} "
+            result_text += f"({covered:,} of {feasible_count:,} feasible values"
+            result_text += f", {iterations:,} left after residue filtering)\n" if engine == "scan" else ")\n"
         result_text += f"💡 **Suggestion:** Try different values of 'a' and 'n'\n"
     else:
         result_text += search_details
+        result_text += budget_note
         result_text += f"\n🎉 **SUMMARY:** Found {len(quadruplets)} quadruplet(s) after {iterations:,} iterations\n"
     
     return result_text, quadruplets
 
 
-def find_cube_quadruplets_range(a_start, a_end, n_start, n_end, max_iterations_per_combo=5000):
+def format_cell_solutions(a, n, quadruplets):
+    """Report lines for the solutions of one (a, n) cell of a range search"""
+    text = f"\n✅ **FOUND {len(quadruplets)} SOLUTION(S) for a={a}, n={n}:**\n"
+    for i, (a_val, b_val, c_val, d_val) in enumerate(quadruplets, 1):
+        text += f"   {i}. ({a_val}, {b_val}, {c_val}, {d_val}) → "
+        text += f"{a_val}³ + {b_val}³ + {c_val}³ = {d_val}³\n"
+        text += f"      Verification: {a_val**3:,} + {b_val**3:,} + {c_val**3:,} = {d_val**3:,} ✓\n"
+    return text
+
+
+def find_cube_quadruplets_range(a_start, a_end, n_start, n_end, max_iterations_per_combo=5000, method="auto",
+                                bloom_fpr=0.0, count_only=False):
     """
     NEW FUNCTION: Search for cube quadruplets across ranges of 'a' and 'n' values
+    method: "scan" searches every cell on its own, "index" probes every d³ - a³ of the grid
+    at once against a sorted table of b³ + c³ with b < a_end, "vector" evaluates the grid
+    as broadcast (a, n, b) tiles, "sweep" walks each a row's d³ - a³ upward against the
+    ascending b³ + c³, "diagonal" solves the cells of each d = a + n together with
+    two-pointer passes over one cube table (both exact at any size), "auto" uses the index
+    when the grid has at least a_end cells and the table stays small
+    bloom_fpr: when > 0 (and cells are scanned one by one), cells whose d³ - a³ a Bloom filter of
+    b³ + c³ rules out are skipped; the filter is sized for this false-positive rate
+    count_only: return an int32 array of solutions per cell (rows follow a, columns n) and a
+    short summary instead of the quadruplets; no tuple or text is built per solution
     """
     try:
         a_start, a_end = int(a_start), int(a_end)
         n_start, n_end = int(n_start), int(n_end)
         max_iterations_per_combo = int(max_iterations_per_combo) if max_iterations_per_combo > 0 else 5000
+        bloom_fpr = float(bloom_fpr) if bloom_fpr and 0 < bloom_fpr < 1 else 0.0
     except (ValueError, TypeError):
         return "Error: Please enter valid integers", []
     
@@ -132,6 +173,21 @@ def find_cube_quadruplets_range(a_start, a_end, n_start, n_end, max_iterations_p
         n_start, n_end = n_end, n_start
     
     total_combinations = (a_end - a_start + 1) * (n_end - n_start + 1)
+    grid_engine = range_search_engine(method, a_end, n_end, total_combinations)
+    
+    if count_only:
+        counts = grid_solution_counts(a_start, a_end, n_start, n_end, method)
+        histogram = np.bincount(counts.ravel())
+        result_text = f"""🔢 **SOLUTION COUNTS PER (a, n) CELL:**
+• a range: {a_start} to {a_end}, n range: {n_start} to {n_end} ({total_combinations:,} cells)
+• Engine: {RANGE_SEARCH_ENGINES[grid_engine] if grid_engine in ("index", "vector") else "per-cell count"}
+• Total solutions: {int(counts.sum()):,}
+• Cells with solutions: {int(np.count_nonzero(counts)):,} ({np.count_nonzero(counts)/total_combinations*100:.2f}%)
+"""
+        for solutions, cells in enumerate(histogram):
+            if cells:
+                result_text += f"   • {solutions} solution(s): {int(cells):,} cell(s)\n"
+        return result_text, counts
     
     result_text = f"""🔍 **RANGE SEARCH FOR CUBE QUADRUPLETS:**
 📊 **Search Parameters:**
@@ -141,64 +197,101 @@ def find_cube_quadruplets_range(a_start, a_end, n_start, n_end, max_iterations_p
 • Max iterations per combination: {max_iterations_per_combo:,}
 • Equation: d³ - a³ = b³ + c³ (where d = a + n)
 • Constraint: d > a > b > c > 0
+• Engine: {RANGE_SEARCH_ENGINES[grid_engine]}
 {'='*80}
 """
     
+    if grid_engine != "scan":
+        # The whole grid is solved up front; the iteration limit does not apply
+        cell_solutions = grid_solutions(grid_engine, a_start, a_end, n_start, n_end)
+    
     all_quadruplets = []
     combinations_tested = 0
     combinations_with_solutions = 0
+    combinations_truncated = 0
+    feasible_total = 0
+    feasible_covered = 0
+    cells_by_divisors = 0
+    cells_by_lookup = 0
+    primitive_index = shared_primitive_index()
+    cache_before = factorization_cache_info()
+    # Targets for the divisor engine are sieved per n over long runs of a (or factored one by one)
+    target_factors = TargetFactorizationCache(a_end, n_end - n_start + 1)
     
-    for a in range(a_start, a_end + 1):
-        for n in range(n_start, n_end + 1):
-            combinations_tested += 1
-            d = a + n
-            target_sum = d**3 - a**3
-            
-            # Progress update
-            if combinations_tested % 10 == 0:
-                progress = (combinations_tested / total_combinations) * 100
-                result_text += f"🔄 Progress: {combinations_tested}/{total_combinations} ({progress:.1f}%) - Testing a={a}, n={n}\n"
-            
-            # Search for quadruplets for this (a, n) combination
-            found_for_this_combo = []
-            iterations = 0
-            max_b = a - 1
-            
-            for b in range(max_b, 0, -1):
-                iterations += 1
-                
-                if iterations > max_iterations_per_combo:
-                    break
+    # Prove cells empty for the whole grid at once so their b loops never run
+    must_search = classify_cells(a_start, a_end, n_start, n_end)
+    cells_pruned = total_combinations - int(must_search.sum())
+    cells_filtered = 0
+    if bloom_fpr and grid_engine == "scan" and a_end > 2 and grid_dtype(a_end, n_end) is not object:
+        sum_filter = TwoCubeSumFilter(a_end - 1, false_positive_rate=bloom_fpr)
+        cells_filtered = filter_cells(must_search, sum_filter, a_start, a_end, n_start, n_end)
+    
+    if grid_engine != "scan":
+        # Every cell is already solved: report straight from the solutions, with the feasible
+        # windows summed as arrays instead of a pass over the cells
+        combinations_tested = total_combinations
+        window_sizes = feasible_window_sizes(a_start, a_end, n_start, n_end)
+        feasible_total = feasible_covered = int(window_sizes[must_search].sum())
+        for (a, n), found_for_this_combo in cell_solutions.items():
+            combinations_with_solutions += 1
+            all_quadruplets.extend(found_for_this_combo)
+            result_text += format_cell_solutions(a, n, found_for_this_combo)
+    else:
+        for a in range(a_start, a_end + 1):
+            for n in range(n_start, n_end + 1):
+                combinations_tested += 1
+                d = a + n
+                target_sum = d**3 - a**3
                 
-                if b >= a or b >= d:
-                    continue
-                    
-                b_cubed = b**3
-                c_cubed_needed = target_sum - b_cubed
+                # Progress update
+                if combinations_tested % 10 == 0:
+                    progress = (combinations_tested / total_combinations) * 100
+                    result_text += f"🔄 Progress: {combinations_tested}/{total_combinations} ({progress:.1f}%) - Testing a={a}, n={n}\n"
                 
-                if c_cubed_needed <= 0:
+                if not must_search[a - a_start, n - n_start]:
                     continue
-                    
-                c_exact = c_cubed_needed**(1/3)
-                c = round(c_exact)
                 
-                if abs(c**3 - c_cubed_needed) < 1e-10:
+                # Search for quadruplets for this (a, n) combination
+                found_for_this_combo = []
+                b_low, b_high = feasible_b_window(a, target_sum)
+                feasible_count = window_size(b_low, b_high)
+                feasible_total += feasible_count
+
+                # With every (a/k, n/k) already known the scaled solutions are looked up
+                # and the b loops only hunt primitives
+                common = math.gcd(a, n)
+                scaled = scaled_cell_solutions(a, n, primitive_index)
+                coprime_to = common if scaled is not None else 1
+
+                # Wide windows are solved over the divisors of d³ - a³, sieved per n where that pays
+                cell_engine = single_search_engine("auto", feasible_count, target_sum)
+                factors = target_factors.factors(a, n) if cell_engine == "divisor" else None
+                found_pairs, _, covered = cell_pairs(a, n, cell_engine, max_iterations_per_combo, coprime_to, factors)
+                cells_by_divisors += cell_engine == "divisor"
+                combinations_truncated += covered < feasible_count
+
+                if covered == feasible_count:
+                    primitive_index.record(a, n, [(a, b, c, d) for b, c in found_pairs
+                                                  if 0 < c < b and math.gcd(b, common) == 1])
+                if scaled:
+                    cells_by_lookup += 1
+                    found_pairs = sorted(found_pairs + [(b, c) for _, b, c, _ in scaled], key=lambda pair: -pair[0])
+
+                for b, c in found_pairs:
                     if (c > 0 and c < b and c < a and c < d and 
                         c != a and c != b and c != d):
                         
-                        if abs(a**3 + b**3 + c**3 - d**3) < 1e-10:
+                        if a**3 + b**3 + c**3 == d**3:
                             quadruplet = (a, b, c, d)
                             found_for_this_combo.append(quadruplet)
                             all_quadruplets.append(quadruplet)
-            
-            # Report findings for this combination
-            if found_for_this_combo:
-                combinations_with_solutions += 1
-                result_text += f"\n✅ **FOUND {len(found_for_this_combo)} SOLUTION(S) for a={a}, n={n}:**\n"
-                for i, (a_val, b_val, c_val, d_val) in enumerate(found_for_this_combo, 1):
-                    result_text += f"   {i}. ({a_val}, {b_val}, {c_val}, {d_val}) → "
-                    result_text += f"{a_val}³ + {b_val}³ + {c_val}³ = {d_val}³\n"
-                    result_text += f"      Verification: {a_val**3:,} + {b_val**3:,} + {c_val**3:,} = {d_val**3:,} ✓\n"
+                
+                feasible_covered += covered
+                
+                # Report findings for this combination
+                if found_for_this_combo:
+                    combinations_with_solutions += 1
+                    result_text += format_cell_solutions(a, n, found_for_this_combo)
     
     # Final summary
     result_text += f"\n{'='*80}\n"
@@ -207,6 +300,24 @@ def find_cube_quadruplets_range(a_start, a_end, n_start, n_end, max_iterations_p
     result_text += f"• Combinations with solutions: {combinations_with_solutions:,}\n"
     result_text += f"• Total quadruplets found: {len(all_quadruplets):,}\n"
     result_text += f"• Success rate: {(combinations_with_solutions/combinations_tested*100):.2f}%\n"
+    result_text += f"• Cells pruned as provably empty: {cells_pruned:,} of {total_combinations:,} "
+    result_text += f"({cells_pruned/total_combinations*100:.1f}%)\n"
+    if cells_filtered:
+        result_text += f"• Cells rejected by the b³ + c³ Bloom filter: {cells_filtered:,} "
+        result_text += f"({sum_filter.memory_bytes / 2**20:.1f} MB, {sum_filter.hash_count} hashes, "
+        result_text += f"~{sum_filter.false_positive_rate:.2%} false positives)\n"
+    if feasible_total:
+        result_text += f"• Feasible b values searched: {feasible_covered:,} of {feasible_total:,} "
+        result_text += f"({feasible_covered/feasible_total*100:.1f}%)\n"
+    if cells_by_divisors:
+        cache_after = factorization_cache_info()
+        result_text += f"• Cells solved over divisors of d³ - a³: {cells_by_divisors:,} "
+        result_text += f"({cache_after.hits - cache_before.hits:,} factorizations reused from cache)\n"
+    if cells_by_lookup:
+        result_text += f"• Cells with scaled solutions looked up from primitives of (a/k, n/k): {cells_by_lookup:,}\n"
+    if combinations_truncated:
+        result_text += f"⚠️ **{combinations_truncated:,} combination(s) stopped at the iteration limit** "
+        result_text += f"before covering their feasible b window\n"
     
     if all_quadruplets:
         result_text += f"\n🏆 **ALL FOUND QUADRUPLETS:**\n"
@@ -222,6 +333,143 @@ def find_cube_quadruplets_range(a_start, a_end, n_start, n_end, max_iterations_p
     return result_text, all_quadruplets
 
 
+def find_first_cube_quadruplets(count=20, d_start=3):
+    """
+    Open-ended search: the first `count` cube quadruplets with d >= d_start,
+    in increasing d, without choosing an (a, n) grid in advance
+    """
+    try:
+        count, d_start = int(count), int(d_start)
+    except (ValueError, TypeError):
+        return "Error: Please enter valid integers", []
+    
+    if count <= 0 or d_start <= 0:
+        return "Error: Both values must be positive integers", []
+    
+    quadruplets = list(islice(iter_quadruplets(d_min=d_start), count))
+    
+    result_text = f"""🔍 **FIRST {count:,} CUBE QUADRUPLETS WITH d >= {d_start}:**
+• Equation: a³ + b³ + c³ = d³ (n = d - a)
+• Order: increasing d, then a
+{'='*80}
+"""
+    for i, (a, b, c, d) in enumerate(quadruplets, 1):
+        result_text += f"{i:2d}. ({a}, {b}, {c}, {d}) → a={a}, n={d - a}\n"
+    result_text += f"\n🎉 **SUMMARY:** {len(quadruplets):,} quadruplet(s) with {d_start} <= d <= {quadruplets[-1][3]}\n"
+    
+    return result_text, quadruplets
+
+
+# Family output is checked against a full search up to this d
+FAMILY_CHECK_MAX_D = 1000
+
+
+def find_family_quadruplets(parameter_bound=12, d_max=1000):
+    """
+    Primitive cube quadruplets from the polynomial parametrizations (no search), with
+    d <= d_max; small d_max are cross-checked against the search
+    """
+    try:
+        parameter_bound, d_max = int(parameter_bound), int(d_max)
+    except (ValueError, TypeError):
+        return "Error: Please enter valid integers", []
+    
+    if parameter_bound <= 0 or d_max <= 0:
+        return "Error: Both values must be positive integers", []
+    
+    quadruplets = family_quadruplets(parameter_bound, d_max)
+    
+    result_text = f"""🧬 **PARAMETRIC FAMILY SOLUTIONS WITH d <= {d_max:,}:**
+• Families: {', '.join(FAMILIES)}
+• Parameters: every value in [-{parameter_bound}, {parameter_bound}]
+• Output: primitive (a, b, c, d) with d > a > b > c > 0
+{'='*80}
+"""
+    for i, (a, b, c, d) in enumerate(quadruplets, 1):
+        result_text += f"{i:2d}. ({a}, {b}, {c}, {d}) → a={a}, n={d - a}\n"
+    result_text += f"\n🎉 **SUMMARY:** {len(quadruplets):,} primitive quadruplet(s) without any search\n"
+    
+    if d_max <= FAMILY_CHECK_MAX_D:
+        searched = {q for q in iter_quadruplets(d_max=d_max) if math.gcd(math.gcd(q[0], q[1]), math.gcd(q[2], q[3])) == 1}
+        unconfirmed = [q for q in quadruplets if q not in searched]
+        result_text += f"🔍 **Check:** the families give {len(quadruplets) - len(unconfirmed):,} of the "
+        result_text += f"{len(searched):,} primitive solutions the search finds up to d = {d_max:,}\n"
+        if unconfirmed:
+            result_text += f"❌ Not found by the search: {unconfirmed}\n"
+    
+    return result_text, quadruplets
+
+
+def find_power_quadruplets_range(k, a_start, a_end, n_start, n_end):
+    """
+    Range search for a^k + b^k + c^k = d^k (d = a + n, d > a > b > c > 0) with the
+    exponent-generic kernels; k = 3 runs on the cube engines
+    """
+    try:
+        k = int(k)
+        a_start, a_end = int(a_start), int(a_end)
+        n_start, n_end = int(n_start), int(n_end)
+    except (ValueError, TypeError):
+        return "Error: Please enter valid integers", []
+    
+    if k < 2:
+        return "Error: The exponent k must be at least 2", []
+    if a_start <= 0 or a_end <= 0 or n_start <= 0 or n_end <= 0:
+        return "Error: All values must be positive integers", []
+    
+    if a_start > a_end:
+        a_start, a_end = a_end, a_start
+    if n_start > n_end:
+        n_start, n_end = n_end, n_start
+    
+    cells = power_grid_solutions(a_start, a_end, n_start, n_end, k)
+    quadruplets = [quadruplet for found in cells.values() for quadruplet in found]
+    
+    result_text = f"""🔍 **RANGE SEARCH FOR a^{k} + b^{k} + c^{k} = d^{k}:**
+• a range: {a_start} to {a_end}, n range: {n_start} to {n_end}
+• Total combinations: {(a_end - a_start + 1) * (n_end - n_start + 1):,}
+• Constraint: d > a > b > c > 0 (d = a + n)
+{'='*80}
+"""
+    for i, (a, b, c, d) in enumerate(quadruplets, 1):
+        result_text += f"{i:2d}. ({a}, {b}, {c}, {d}) → {a}^{k} + {b}^{k} + {c}^{k} = {d}^{k}\n"
+    result_text += f"\n🎉 **SUMMARY:** {len(quadruplets):,} solution(s) in {len(cells):,} combination(s)\n"
+    
+    return result_text, quadruplets
+
+
+def find_taxicab_cells(limit=10**9):
+    """
+    Every (a, n) cell holding more than one quadruplet with d³ - a³ <= limit, mined from the
+    sums of two cubes that have several representations (1729 = 12³ + 1³ = 10³ + 9³, ...)
+    """
+    try:
+        limit = int(limit)
+    except (ValueError, TypeError):
+        return "Error: Please enter a valid integer", []
+    
+    if limit <= 0:
+        return "Error: The bound must be a positive integer", []
+    # The sums index grows with limit^(2/3); keep it to the size range searches build on their own
+    limit = min(limit, INDEX_AUTO_MAX_B ** 3)
+    
+    cells = taxicab_cells(limit)
+    quadruplets = [quadruplet for found in cells.values() for quadruplet in found]
+    
+    result_text = f"""🚕 **CELLS WITH SEVERAL SOLUTIONS, d³ - a³ <= {limit:,}:**
+• d³ - a³ = b³ + c³ in two or more ways (a taxicab number with b < a)
+{'='*80}
+"""
+    for (a, n), found in cells.items():
+        target_sum = (a + n) ** 3 - a ** 3
+        result_text += f"\n✅ a={a}, n={n}: d³ - a³ = {target_sum:,}\n"
+        for _, b, c, d in found:
+            result_text += f"   • ({a}, {b}, {c}, {d}) → {b}³ + {c}³ = {target_sum:,}\n"
+    result_text += f"\n🎉 **SUMMARY:** {len(cells):,} cell(s) with {len(quadruplets):,} quadruplets between them\n"
+    
+    return result_text, quadruplets
+
+
 def verify_equation_step_by_step(a, b, c, d):
     """
     Detailed step-by-step verification showing the equation d³ - a³ = b³ + c³
@@ -347,6 +595,10 @@ def create_improved_interface():
                         n_start_input = gr.Number(label="'n' start value", value=1, precision=0)
                         n_end_input = gr.Number(label="'n' end value", value=5, precision=0)
                         max_iter_range = gr.Number(label="Max iterations per combination", value=3000, precision=0)
+                        range_method = gr.Radio(choices=["auto", "index", "vector", "sweep", "diagonal", "scan"], value="auto",
+                                                label="Search engine (index: probe all cells against sorted b³ + c³, vector: NumPy (a, n, b) tiles, sweep: ascending b³ + c³ per a, diagonal: cells sharing d together, scan: cell by cell)")
+                        range_bloom_fpr = gr.Number(label="Bloom filter false-positive rate for scans (0 = off)", value=0)
+                        range_count_only = gr.Checkbox(label="Count solutions per cell only (no quadruplet list)", value=False)
                         range_search_btn = gr.Button("🎯 Start Range Search", variant="primary")
                     
                     with gr.Column():
@@ -356,7 +608,8 @@ def create_improved_interface():
                 
                 range_search_btn.click(
                     find_cube_quadruplets_range,
-                    inputs=[a_start_input, a_end_input, n_start_input, n_end_input, max_iter_range],
+                    inputs=[a_start_input, a_end_input, n_start_input, n_end_input, max_iter_range, range_method,
+                            range_bloom_fpr, range_count_only],
                     outputs=[range_search_output, range_quadruplets_state]
                 )
             
@@ -372,6 +625,8 @@ def create_improved_interface():
                         a_input = gr.Number(label="Value of 'a' (positive integer)", value=6, precision=0)
                         n_input = gr.Number(label="Value of 'n' (positive integer)", value=3, precision=0)
                         max_iter = gr.Number(label="Max iterations (0 for default 10k)", value=20000, precision=0)
+                        search_method = gr.Radio(choices=["auto", "divisor", "jit", "vector", "scan"], value="auto",
+                                                 label="Search engine (divisor: factor d³ - a³, jit: compiled b loop if Numba is installed, vector: NumPy b window, scan: walk b)")
                         search_btn = gr.Button("🚀 Start Search", variant="primary")
                     
                     with gr.Column():
@@ -381,11 +636,111 @@ def create_improved_interface():
                 
                 search_btn.click(
                     find_cube_quadruplets_improved,
-                    inputs=[a_input, n_input, max_iter],
+                    inputs=[a_input, n_input, max_iter, search_method],
                     outputs=[search_output, quadruplets_state]
                 )
             
-            # Tab 3: Step-by-step verification
+            # Tab 3: First solutions in increasing d
+            with gr.Tab("📈 First Solutions"):
+                gr.Markdown("""
+                ### 📈 List the first solutions in increasing d
+                **No grid needed:** the search grows d until enough quadruplets are found
+                """)
+                
+                with gr.Row():
+                    with gr.Column():
+                        first_count_input = gr.Number(label="How many solutions", value=20, precision=0)
+                        first_d_start_input = gr.Number(label="Smallest d", value=3, precision=0)
+                        first_search_btn = gr.Button("📈 List Solutions", variant="primary")
+                    
+                    with gr.Column():
+                        first_search_output = gr.Textbox(label="First Solutions", lines=20, max_lines=25)
+                
+                first_quadruplets_state = gr.State([])
+                
+                first_search_btn.click(
+                    find_first_cube_quadruplets,
+                    inputs=[first_count_input, first_d_start_input],
+                    outputs=[first_search_output, first_quadruplets_state]
+                )
+            
+            # Tab 4: Solutions from parametric families
+            with gr.Tab("🧬 Parametric Families"):
+                gr.Markdown("""
+                ### 🧬 Solutions from Ramanujan's, Euler/Binet's and Mahler's parametrizations
+                **No search:** each parameter choice is one polynomial evaluation
+                """)
+                
+                with gr.Row():
+                    with gr.Column():
+                        family_bound_input = gr.Number(label="Parameter bound", value=12, precision=0)
+                        family_d_max_input = gr.Number(label="Largest d", value=1000, precision=0)
+                        family_btn = gr.Button("🧬 Generate Solutions", variant="primary")
+                    
+                    with gr.Column():
+                        family_output = gr.Textbox(label="Family Solutions", lines=20, max_lines=25)
+                
+                family_quadruplets_state = gr.State([])
+                
+                family_btn.click(
+                    find_family_quadruplets,
+                    inputs=[family_bound_input, family_d_max_input],
+                    outputs=[family_output, family_quadruplets_state]
+                )
+            
+            # Tab 5: Other exponents
+            with gr.Tab("⚡ Higher Powers"):
+                gr.Markdown("""
+                ### ⚡ Range search for a^k + b^k + c^k = d^k
+                **Same kernels, any exponent:** windows, residue filters and sorted sums are built for k
+                """)
+                
+                with gr.Row():
+                    with gr.Column():
+                        power_k = gr.Number(label="Exponent k", value=4, precision=0)
+                        with gr.Row():
+                            power_a_start = gr.Number(label="a start", value=1, precision=0)
+                            power_a_end = gr.Number(label="a end", value=100, precision=0)
+                        with gr.Row():
+                            power_n_start = gr.Number(label="n start", value=1, precision=0)
+                            power_n_end = gr.Number(label="n end", value=100, precision=0)
+                        power_search_btn = gr.Button("⚡ Search", variant="primary")
+                    
+                    with gr.Column():
+                        power_output = gr.Textbox(label="Higher Power Results", lines=20, max_lines=25)
+                
+                power_quadruplets_state = gr.State([])
+                
+                power_search_btn.click(
+                    find_power_quadruplets_range,
+                    inputs=[power_k, power_a_start, power_a_end, power_n_start, power_n_end],
+                    outputs=[power_output, power_quadruplets_state]
+                )
+            
+            # Tab 6: Cells with several solutions
+            with gr.Tab("🚕 Taxicab Cells"):
+                gr.Markdown("""
+                ### 🚕 Cells whose d³ - a³ is a sum of two cubes in several ways
+                **One pass over the sorted b³ + c³:** equal neighbours are the taxicab numbers
+                """)
+                
+                with gr.Row():
+                    with gr.Column():
+                        taxicab_limit_input = gr.Number(label="Largest d³ - a³", value=10**9, precision=0)
+                        taxicab_btn = gr.Button("🚕 Find Cells", variant="primary")
+                    
+                    with gr.Column():
+                        taxicab_output = gr.Textbox(label="Cells with Several Solutions", lines=20, max_lines=25)
+                
+                taxicab_quadruplets_state = gr.State([])
+                
+                taxicab_btn.click(
+                    find_taxicab_cells,
+                    inputs=[taxicab_limit_input],
+                    outputs=[taxicab_output, taxicab_quadruplets_state]
+                )
+            
+            # Tab 7: Step-by-step verification
             with gr.Tab("🔍 Step-by-Step Verification"):
                 gr.Markdown("### 🧮 Detailed verification: d³ - a³ = b³ + c³")
                 
@@ -406,7 +761,7 @@ def create_improved_interface():
                     outputs=verify_output
                 )
             
-            # Tab 4: Test known solutions
+            # Tab 8: Test known solutions
             with gr.Tab("🧪 Known Solutions Test"):
                 gr.Markdown("### 📋 Test mathematically known cube quadruplet solutions")
                 
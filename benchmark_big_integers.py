@@ -0,0 +1,91 @@
+"""
+Benchmark: pure-Python vs gmpy2 cube roots and gcds by operand size.
+Prints one row per bit length and, for each operation, the smallest size from which
+gmpy2 wins it; the root crossovers are the value to use for cube_math.GMPY2_ROOT_MIN_BITS
+on this machine.
+Usage: python benchmark_big_integers.py
+"""
+import random
+import sys
+from math import gcd
+from timeit import timeit
+
+from cube_math import CUBE_RESIDUES_703, CUBE_RESIDUES_819, _icbrt_python
+
+try:
+    import gmpy2
+except ImportError:
+    gmpy2 = None
+
+BIT_LENGTHS = (64, 80, 100, 128, 160, 200, 256, 384, 512, 1024, 2048, 4096)
+SAMPLES = 200
+
+
+def _exact_root_python(n):
+    if not CUBE_RESIDUES_819[n % 819] or not CUBE_RESIDUES_703[n % 703]:
+        return None
+    root = _icbrt_python(n)
+    return root if root * root * root == n else None
+
+
+def _exact_root_gmpy2(n):
+    if not CUBE_RESIDUES_819[n % 819] or not CUBE_RESIDUES_703[n % 703]:
+        return None
+    root, exact = gmpy2.iroot(n, 3)
+    return int(root) if exact else None
+
+
+def _operations():
+    """name: (pure-Python function, gmpy2 function, argument builder)"""
+    return {
+        "icbrt": (_icbrt_python, lambda n: int(gmpy2.iroot(n, 3)[0]), lambda n, rng: (n,)),
+        # Cubes, so both paths pass the residue filters and take the root
+        "exact_cube_root": (_exact_root_python, _exact_root_gmpy2, lambda n, rng: (_icbrt_python(n) ** 3,)),
+        "gcd": (gcd, lambda *x: int(gmpy2.gcd(*x)),
+                lambda n, rng: (n, rng.getrandbits(n.bit_length()) | 1, rng.getrandbits(n.bit_length()) | 1)),
+    }
+
+
+def run(bit_lengths=BIT_LENGTHS, samples=SAMPLES, seed=0):
+    """Rows of (bits, {operation: (python seconds, gmpy2 seconds)}); results are checked to agree"""
+    rng = random.Random(seed)
+    rows = []
+    for bits in bit_lengths:
+        values = [rng.getrandbits(bits) | (1 << (bits - 1)) for _ in range(samples)]
+        timings = {}
+        for name, (python_op, gmpy2_op, build) in _operations().items():
+            arguments = [build(n, rng) for n in values]
+            if [python_op(*args) for args in arguments] != [gmpy2_op(*args) for args in arguments]:
+                raise AssertionError(f"{name} differs between the backends at {bits} bits")
+            timings[name] = tuple(
+                timeit(lambda op=op: [op(*args) for args in arguments], number=5) / (5 * samples)
+                for op in (python_op, gmpy2_op)
+            )
+        rows.append((bits, timings))
+    return rows
+
+
+def crossovers(rows):
+    """{operation: smallest bit length from which gmpy2 is faster at every larger size, or None}"""
+    found = {}
+    for name in rows[0][1]:
+        found[name] = None
+        for i, (bits, _) in enumerate(rows):
+            if all(timings[name][1] < timings[name][0] for _, timings in rows[i:]):
+                found[name] = bits
+                break
+    return found
+
+
+if __name__ == "__main__":
+    if gmpy2 is None:
+        sys.exit("gmpy2 is not installed: pip install gmpy2")
+    rows = run()
+    names = list(rows[0][1])
+    print(f"{'bits':>6} " + " ".join(f"{name + ' py/gmpy2 (µs)':>30}" for name in names))
+    for bits, timings in rows:
+        cells = (f"{timings[name][0] * 1e6:>14.2f} / {timings[name][1] * 1e6:<13.2f}" for name in names)
+        print(f"{bits:>6} " + " ".join(cells))
+    for name, bits in crossovers(rows).items():
+        print(f"{name}: gmpy2 wins from {bits} bits" if bits else f"{name}: gmpy2 never wins up to {rows[-1][0]} bits")
+    print("cube_math.GMPY2_ROOT_MIN_BITS is set from the root crossovers; gcds stay on math.gcd")
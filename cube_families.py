@@ -0,0 +1,87 @@
+"""
+Polynomial parametrizations of a³ + b³ + c³ = d³ that produce solutions without a search
+"""
+from functools import reduce
+from math import gcd
+
+# Parameters of the family seeds a range search adds to its scaled families
+FAMILY_SEED_BOUND = 12
+
+
+def ramanujan(m, n):
+    """Ramanujan: (3m² + 5mn - 5n²)³ + (4m² - 4mn + 6n²)³ + (5m² - 5mn - 3n²)³ = (6m² - 4mn + 4n²)³"""
+    return (3 * m * m + 5 * m * n - 5 * n * n, 4 * m * m - 4 * m * n + 6 * n * n,
+            5 * m * m - 5 * m * n - 3 * n * n, -(6 * m * m - 4 * m * n + 4 * n * n))
+
+
+def euler_binet(p, q):
+    """
+    Euler/Binet, with s = p² + 3q²:
+    (1 - (p - 3q)s)³ + ((p + 3q)s - 1)³ = ((p + 3q) - s²)³ + (s² - (p - 3q))³
+    """
+    s = p * p + 3 * q * q
+    return (1 - (p - 3 * q) * s, (p + 3 * q) * s - 1, s * s - (p + 3 * q), (p - 3 * q) - s * s)
+
+
+def mahler(t):
+    """Mahler: (9t⁴)³ + (3t - 9t⁴)³ + (1 - 9t³)³ = 1"""
+    return (9 * t ** 4, 3 * t - 9 * t ** 4, 1 - 9 * t ** 3, -1)
+
+
+# name: (four signed terms whose cubes sum to zero, number of parameters)
+FAMILIES = {
+    "ramanujan": (ramanujan, 2),
+    "euler_binet": (euler_binet, 2),
+    "mahler": (mahler, 1),
+}
+
+
+def canonical_quadruplet(terms):
+    """
+    The primitive (a, b, c, d) with d > a > b > c > 0 behind four signed integers whose cubes
+    sum to zero, or None when they do not describe one: a zero term, a repeated value, or a
+    two-against-two split (a taxicab identity x³ + y³ = z³ + w³ instead).
+    """
+    if 0 in terms:
+        return None
+    positive = [x for x in terms if x > 0]
+    negative = [-x for x in terms if x < 0]
+    if len(negative) == 3:
+        positive, negative = negative, positive
+    if len(positive) != 3:
+        return None
+    c, b, a = sorted(positive)
+    d = negative[0]
+    if not d > a > b > c:
+        return None
+    g = reduce(gcd, (a, b, c, d))
+    return (a // g, b // g, c // g, d // g)
+
+
+def iter_family_quadruplets(parameter_bound):
+    """
+    Yield (family, parameters, quadruplet) for every family and every parameter tuple with
+    entries in [-parameter_bound, parameter_bound] that gives a solution. Two-parameter
+    families skip (m, n) with gcd(m, n) > 1, which only rescale the terms.
+    """
+    values = range(-parameter_bound, parameter_bound + 1)
+    for name, (family, arity) in FAMILIES.items():
+        if arity == 1:
+            parameter_sets = ((t,) for t in values)
+        else:
+            parameter_sets = ((m, n) for m in values for n in values if gcd(m, n) == 1)
+        for parameters in parameter_sets:
+            quadruplet = canonical_quadruplet(family(*parameters))
+            if quadruplet is not None:
+                yield name, parameters, quadruplet
+
+
+def family_quadruplets(parameter_bound, d_max=None):
+    """
+    Distinct primitive solutions from all families up to parameter_bound (those with
+    d <= d_max when given), ordered by d, then a, then b descending
+    """
+    found = {quadruplet for _, _, quadruplet in iter_family_quadruplets(parameter_bound)}
+    if d_max is not None:
+        found = {quadruplet for quadruplet in found if quadruplet[3] <= d_max}
+    return sorted(found, key=lambda q: (q[3], q[0], -q[1]))
@@ -0,0 +1,91 @@
+"""
+Whole-grid helpers for the (a, n) range searches
+"""
+import numpy as np
+from cube_math import icbrt
+
+INT64_LIMIT = 2**63
+
+
+def grid_dtype(a_end, n_end, exponent=3):
+    """int64 while every d³ of the grid (times 2) fits, Python ints otherwise (d^k for another exponent)"""
+    return np.int64 if 2 * (a_end + n_end) ** exponent < INT64_LIMIT else object
+
+
+def grid_axes(a_start, a_end, n_start, n_end, exponent=3):
+    """Column vector of a values and row vector of n values, ready to broadcast"""
+    dtype = grid_dtype(a_end, n_end, exponent)
+    a = np.array(range(a_start, a_end + 1), dtype=dtype)[:, None]
+    n = np.array(range(n_start, n_end + 1), dtype=dtype)[None, :]
+    return a, n
+
+
+def classify_cells(a_start, a_end, n_start, n_end):
+    """
+    Classify every (a, n) cell of the grid before any b loop runs.
+    Returns a bool array (rows follow a, columns follow n):
+    True = must search, False = provably empty.
+    """
+    # d³ - a³ = d³ + (-a)³ is already a sum of two cubes modulo every m, so
+    # congruences never rule a cell out. Size does: b < a and c < b force
+    # T/2 < b³ <= (a - 1)³, so the cell is empty unless 2(a - 1)³ > T.
+    a, n = grid_axes(a_start, a_end, n_start, n_end)
+    target_sum = (a + n) ** 3 - a ** 3
+    return 2 * (a - 1) ** 3 > target_sum
+
+
+def _icbrt_array(values):
+    """Exact integer cube roots of a non-negative array (int64, or Python ints as object)"""
+    if values.dtype == object:
+        return np.frompyfunc(icbrt, 1, 1)(values)
+    # The float root is within one of the true root below 2^63; one step each way fixes it
+    root = np.floor(np.cbrt(values.astype(np.float64))).astype(np.int64)
+    root -= root ** 3 > values
+    root += (root + 1) ** 3 <= values
+    return root
+
+
+def feasible_window_sizes(a_start, a_end, n_start, n_end):
+    """Width of every cell's feasible b window, as feasible_b_window() gives it, for the whole grid"""
+    a, n = grid_axes(a_start, a_end, n_start, n_end)
+    target_sum = (a + n) ** 3 - a ** 3
+    b_low = _icbrt_array(target_sum // 2) + 1
+    b_high = np.minimum(a - 1, _icbrt_array(target_sum - 1))
+    return np.maximum(b_high - b_low + 1, 0)
+
+
+def filter_cells(must_search, sum_filter, a_start, a_end, n_start, n_end):
+    """
+    Clear every must-search cell whose d³ - a³ the two-cube-sum filter rules out.
+    Returns the number of cells cleared.
+    """
+    a, n = grid_axes(a_start, a_end, n_start, n_end)
+    may_have_solution = sum_filter.contains((a + n) ** 3 - a ** 3)
+    cleared = int((must_search & ~may_have_solution).sum())
+    must_search &= may_have_solution
+    return cleared
+
+
+def scale_closure(primitives, a_start, a_end, n_start, n_end):
+    """
+    Every multiple k·(a, b, c, d), k >= 2, of the given primitives whose cell (k·a, k·n)
+    lies in the grid, for all primitives at once: k runs over the closed interval
+    max(⌈a_start/a⌉, ⌈n_start/n⌉, 2) <= k <= min(⌊a_end/a⌋, ⌊n_end/n⌋).
+    Returns [(k, scaled quadruplet), ...] grouped by primitive with k ascending.
+    """
+    if not primitives:
+        return []
+    dtype = grid_dtype(a_end, n_end)
+    quads = np.array(primitives, dtype=dtype)
+    a = quads[:, 0]
+    n = quads[:, 3] - a
+    k_low = np.maximum(np.maximum(-(-a_start // a), -(-n_start // n)), 2)
+    k_high = np.minimum(a_end // a, n_end // n)
+
+    # Expand the intervals without a Python loop: one row per (primitive, k)
+    counts = np.maximum(k_high - k_low + 1, 0).astype(np.int64)
+    owner = np.repeat(np.arange(len(quads)), counts)
+    first_row = np.repeat(np.cumsum(counts) - counts, counts)
+    k = k_low[owner] + (np.arange(len(owner)) - first_row)
+    scaled = quads[owner] * k[:, None]
+    return [(int(factor), tuple(int(x) for x in row)) for factor, row in zip(k, scaled)]
@@ -0,0 +1,474 @@
+"""
+Vectorized (NumPy) b-window kernels for the cube quadruplet searches
+"""
+from functools import lru_cache
+from math import gcd
+import numpy as np
+try:
+    from numba import njit
+except ImportError:  # the compiled kernel is optional; the interpreted engines cover everything
+    njit = None
+from cube_grid import INT64_LIMIT, classify_cells, grid_axes, grid_dtype
+from cube_math import (DIVISOR_ENGINE_MAX_BITS, DIVISOR_ENGINE_MIN_WINDOW, divisor_search_bounds, exact_cube_root, exact_root,
+                       feasible_b_window, power_residue_table, two_cube_pairs_from_divisors, wheel_candidates,
+                       window_size)
+from cube_sums import INDEX_AUTO_MAX_B, grid_quadruplets, grid_quadruplets_diagonal, shared_index, sweep_row
+from factorization import divisors_in_range, factorize, target_factorization
+
+# b values handled per array operation, which bounds the kernel's working memory
+VECTOR_CHUNK = 1 << 16
+
+# Other exponents filter by up to this many coprime prime-power moduli below _RESIDUE_MODULUS_LIMIT
+_RESIDUE_MODULUS_LIMIT = 1024
+_RESIDUE_FILTER_COUNT = 3
+
+
+@lru_cache(maxsize=None)
+def _residue_filters(exponent=3):
+    """
+    (modulus, k-th powers of 0 .. modulus - 1, k-th power residue table) triples that b^k + c^k
+    must pass: 819 = 7·9·13 and 703 = 19·37 for cubes, otherwise the pairwise coprime prime
+    powers with the sparsest k-th power residues (kept while under half of the classes survive)
+    """
+    if exponent == 3:
+        moduli = (819, 703)
+    else:
+        candidates = []
+        for p in (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 61, 67, 73, 79, 97, 101, 109, 113):
+            q = p
+            while q < _RESIDUE_MODULUS_LIMIT:
+                candidates.append((sum(power_residue_table(q, exponent)) / q, q, p))
+                q *= p
+        moduli, used_primes = [], set()
+        for density, q, p in sorted(candidates):
+            if density >= 0.5 or len(moduli) == _RESIDUE_FILTER_COUNT:
+                break
+            if p not in used_primes:
+                used_primes.add(p)
+                moduli.append(q)
+    return tuple(
+        (modulus, np.array([pow(x, exponent, modulus) for x in range(modulus)], dtype=np.int64),
+         np.array(power_residue_table(modulus, exponent), dtype=bool))
+        for modulus in moduli
+    )
+
+
+def _int64_chunk_pairs(target_sum, b_top, count, coprime_to=1, exponent=3):
+    """(b, c) hits for b = b_top, b_top - 1, ... (count values); target_sum < 2^63"""
+    b = b_top - np.arange(count, dtype=np.int64)
+    if coprime_to > 1:
+        b = b[np.gcd(b, coprime_to) == 1]
+    if exponent == 3:
+        remainder = target_sum - b * b * b
+        # A float cube root of an exact cube below 2^63 rounds to the true root
+        c = np.rint(np.cbrt(remainder)).astype(np.int64)
+    else:
+        remainder = target_sum - b ** exponent
+        c = np.rint(np.power(np.maximum(remainder, 0).astype(np.float64), 1.0 / exponent)).astype(np.int64)
+    hit = (c ** exponent == remainder) & (c >= 1) & (c < b)
+    return [(int(b_hit), int(c_hit)) for b_hit, c_hit in zip(b[hit], c[hit])]
+
+
+def _residue_chunk_pairs(target_sum, b_top, count, coprime_to=1, exponent=3):
+    """
+    (b, c) hits for b = b_top, b_top - 1, ... (count values) at any size: the power-residue
+    tables are applied to all b at once in int64, exact roots only to the survivors
+    """
+    offsets = np.arange(count, dtype=np.int64)
+    survivors = np.ones(count, dtype=bool)
+    for modulus, powers, is_power in _residue_filters(exponent):
+        b_residue = (b_top % modulus - offsets) % modulus
+        survivors &= is_power[(target_sum % modulus - powers[b_residue]) % modulus]
+
+    pairs = []
+    for offset in np.flatnonzero(survivors):
+        b = b_top - int(offset)
+        if coprime_to > 1 and gcd(b, coprime_to) > 1:
+            continue
+        c = exact_root(target_sum - b ** exponent, exponent)
+        if c is not None and 0 < c < b:
+            pairs.append((b, c))
+    return pairs
+
+
+def window_pairs_vectorized(target_sum, b_low, b_high, max_count=None, coprime_to=1, exponent=3):
+    """
+    All (b, c) with b³ + c³ = target_sum and b_high >= b > c >= 1, b >= b_low, b descending,
+    evaluated VECTOR_CHUNK values of b at a time (b^k + c^k for another exponent). Uses exact
+    int64 arithmetic while target_sum < 2^63 and the residue-filtered exact path above that.
+    b sharing a factor with coprime_to are dropped before any root is taken.
+    Returns (pairs, covered): covered is how many b values were examined (max_count caps it).
+    """
+    total = max(0, b_high - b_low + 1)
+    if max_count is not None:
+        total = min(total, max_count)
+    chunk_pairs = _int64_chunk_pairs if target_sum < INT64_LIMIT else _residue_chunk_pairs
+
+    pairs = []
+    for start in range(0, total, VECTOR_CHUNK):
+        pairs.extend(chunk_pairs(target_sum, b_high - start, min(VECTOR_CHUNK, total - start), coprime_to, exponent))
+    return pairs, total
+
+
+def _window_hits_loop(target_sum, b_low, b_high, max_count, coprime_to):
+    """
+    b values (descending) with target_sum - b³ = c³, b > c >= 1, and how many b were examined:
+    window positions, counting those coprime_to prunes, as window_pairs_vectorized() does.
+    One b at a time in int64 arithmetic (target_sum < 2^63); JIT-compiled when Numba is present.
+    """
+    hits = np.zeros(16, dtype=np.int64)
+    count = 0
+    examined = 0
+    b = b_high
+    while b >= b_low and examined < max_count:
+        examined += 1
+        if coprime_to > 1 and gcd(b, coprime_to) > 1:
+            b -= 1
+            continue
+        remainder = target_sum - b * b * b
+        c = int(np.cbrt(float(remainder)) + 0.5)
+        while c * c * c > remainder:
+            c -= 1
+        while (c + 1) * (c + 1) * (c + 1) <= remainder:
+            c += 1
+        if c >= 1 and c < b and c * c * c == remainder:
+            if count == hits.size:
+                hits = np.concatenate((hits, np.zeros_like(hits)))
+            hits[count] = b
+            count += 1
+        b -= 1
+    return hits[:count], examined
+
+
+NUMBA_AVAILABLE = njit is not None
+_compiled_window_hits = njit(cache=True, nogil=True)(_window_hits_loop) if NUMBA_AVAILABLE else None
+
+
+def window_pairs_compiled(target_sum, b_low, b_high, max_count=None, coprime_to=1):
+    """
+    Same contract as window_pairs_vectorized(), from the Numba-compiled b loop (the
+    interpreted engines are the fallback when Numba is not installed). Needs target_sum < 2^63.
+    """
+    if target_sum >= INT64_LIMIT:
+        raise ValueError("window_pairs_compiled() needs d³ - a³ below 2^63")
+    total = max(0, b_high - b_low + 1)
+    if max_count is not None:
+        total = min(total, max_count)
+    if not total:
+        return [], 0
+    hits, examined = _compiled_window_hits(target_sum, b_low, b_high, total, coprime_to)
+    return [(int(b), exact_cube_root(target_sum - int(b) ** 3)) for b in hits], int(examined)
+
+
+# Below this window width the interpreted wheel scan beats the array set-up cost
+VECTOR_MIN_WINDOW = 64
+
+SINGLE_SEARCH_ENGINES = {
+    "divisor": "divisors of d³ - a³",
+    "jit": "compiled b window scan (Numba)",
+    "vector": "vectorized b window (NumPy)",
+    "scan": "b window scan",
+}
+
+
+def single_search_engine(method, feasible_count, target_sum=None):
+    """
+    Engine for one (a, n) search: an explicit method is honoured, "auto" picks by window width
+    (scan for narrow windows, the vector kernel in between, divisors for wide windows whose
+    target_sum is small enough to factor quickly; the budgeted kernels take larger ones). With
+    Numba installed and target_sum below 2^63, "auto" runs every window narrower than the
+    divisor threshold through the compiled loop; "jit" falls back to "scan" without it.
+    """
+    if not feasible_count:
+        return "scan"
+    compiled = NUMBA_AVAILABLE and target_sum is not None and target_sum < INT64_LIMIT
+    if method == "jit":
+        return method if compiled else "scan"
+    if method in SINGLE_SEARCH_ENGINES:
+        return method
+    factorable = target_sum is None or target_sum.bit_length() <= DIVISOR_ENGINE_MAX_BITS
+    if feasible_count >= DIVISOR_ENGINE_MIN_WINDOW and factorable:
+        return "divisor"
+    if compiled:
+        return "jit"
+    return "vector" if feasible_count >= VECTOR_MIN_WINDOW else "scan"
+
+
+def cell_pairs(a, n, method="auto", max_count=None, coprime_to=1, factors=None):
+    """
+    (b, c) of the solutions of the cell (a, n), b descending, from the engine
+    single_search_engine() picks for method, with (pairs, examined, covered): examined is
+    the work done (divisors of d³ - a³ tried, window positions for the vector and compiled
+    kernels, b left by the residue wheel for the scan) and covered how many b of the
+    feasible window, from the top down, were ruled on. max_count caps the b values examined
+    (the divisor engine always covers the whole window). b sharing a factor with coprime_to
+    are skipped; factors is the factorization of d³ - a³ when it is already known.
+    """
+    d = a + n
+    target_sum = d ** 3 - a ** 3
+    b_low, b_high = feasible_b_window(a, target_sum)
+    feasible_count = window_size(b_low, b_high)
+    engine = single_search_engine(method, feasible_count, target_sum)
+
+    if engine == "divisor":
+        # Every solution has s = b + c | d³ - a³ with s³/4 <= d³ - a³ < s³
+        s_low, s_high = divisor_search_bounds(target_sum)
+        divisors = divisors_in_range(factors or target_factorization(a, n), s_low, s_high)
+        pairs = [(b, c) for b, c in two_cube_pairs_from_divisors(target_sum, divisors)
+                 if b < a and gcd(b, coprime_to) == 1]
+        return pairs, len(divisors), feasible_count
+    if engine in ("vector", "jit"):
+        window_pairs = window_pairs_compiled if engine == "jit" else window_pairs_vectorized
+        pairs, covered = window_pairs(target_sum, b_low, b_high, max_count, coprime_to)
+        return pairs, covered, covered
+
+    # The residue wheel skips every b whose class modulo 7·9·13·19 cannot leave a cube for c³
+    pairs = []
+    examined = 0
+    covered = feasible_count
+    for b in wheel_candidates(target_sum, b_low, b_high):
+        if max_count is not None and examined >= max_count:
+            covered = b_high - b
+            break
+        if coprime_to > 1 and gcd(b, coprime_to) > 1:
+            continue
+        examined += 1
+        c = exact_cube_root(target_sum - b ** 3)
+        if c is not None:
+            pairs.append((b, c))
+    return pairs, examined, covered
+
+
+def search_budget_note(max_count, covered, feasible_count):
+    """Markdown note for a search that stopped on its iteration limit"""
+    note = f"⚠️ **Search stopped after {max_count:,} iterations** "
+    note += f"(covered {covered:,} of {feasible_count:,} feasible b values, {covered / feasible_count * 100:.1f}%)\n"
+    return note
+
+
+def primitive_cell_pairs(a, n, max_count=None):
+    """
+    (b, c) of the primitive solutions (gcd(a, b, c, d) = 1) of the cell (a, n), b descending,
+    and how many b values were examined (max_count caps it). A prime p | gcd(a, n) divides
+    d as well, so p | b would force p³ | c³ and hence p | c: those b are pruned before any
+    cube root, and every pair that survives is primitive. Cells with gcd(a, n) = 1 only
+    hold primitive solutions. The engine is chosen as for a single "auto" search.
+    """
+    pairs, examined, _ = cell_pairs(a, n, "auto", max_count, coprime_to=gcd(a, n))
+    return pairs, examined
+
+
+# Cells a PrimitiveRatioIndex records before it stops growing (lookups then fall back to searching)
+PRIMITIVE_INDEX_MAX_CELLS = 1 << 18
+
+
+class PrimitiveRatioIndex:
+    """
+    Primitive solutions of fully searched cells. k·(a0, b0, c0, d0) lies in the cell
+    (k·a0, k·n0) on the same ratio, so the scaled solutions of a cell are the primitives
+    recorded for the cells (a/k, n/k) with k | gcd(a, n), k > 1. Almost every cell has no
+    primitive: those are kept as packed integers in a set, and only cells with primitives
+    hold a list.
+    """
+
+    def __init__(self, max_cells=PRIMITIVE_INDEX_MAX_CELLS):
+        self.max_cells = max_cells
+        self._empty = set()
+        self._found = {}
+
+    @property
+    def cells(self):
+        """Number of cells recorded"""
+        return len(self._empty) + len(self._found)
+
+    @staticmethod
+    def _empty_key(a, n):
+        return a << 32 | n if n < 1 << 32 else (a, n)
+
+    def record(self, a, n, primitives):
+        """Store the primitive solutions of the cell (a, n), which must have been searched in full"""
+        if self.primitives(a, n) is None and self.cells >= self.max_cells:
+            return
+        if primitives:
+            self._found[(a, n)] = list(primitives)
+        else:
+            self._empty.add(self._empty_key(a, n))
+
+    def primitives(self, a, n):
+        """Primitive solutions of the cell (a, n), or None if it has not been recorded"""
+        if self._empty_key(a, n) in self._empty:
+            return []
+        return self._found.get((a, n))
+
+    def clear(self):
+        """Forget every recorded cell"""
+        self._empty.clear()
+        self._found.clear()
+
+
+_shared_primitives = PrimitiveRatioIndex()
+
+
+def shared_primitive_index():
+    """Process-wide PrimitiveRatioIndex shared by the single and range searches"""
+    return _shared_primitives
+
+
+def reset_shared_primitive_index():
+    """Empty the process-wide PrimitiveRatioIndex, releasing its memory"""
+    _shared_primitives.clear()
+
+
+def scaled_cell_solutions(a, n, index):
+    """
+    The non-primitive solutions of the cell (a, n), b descending, by index lookup: each is
+    k times a primitive of the cell (a/k, n/k) for some k | gcd(a, n), k > 1. Returns None
+    while any of those cells is missing from the index; the cell then needs a full search.
+    """
+    g = gcd(a, n)
+    if g == 1:
+        return []
+    scaled = []
+    for k in divisors_in_range(factorize(g), 2, g):
+        reduced = index.primitives(a // k, n // k)
+        if reduced is None:
+            return None
+        scaled.extend(tuple(k * x for x in quadruplet) for quadruplet in reduced)
+    scaled.sort(key=lambda quadruplet: -quadruplet[1])
+    return scaled
+
+
+# Working memory a grid tile may use; each (a, n, b) element costs about _TILE_ELEMENT_BYTES
+GRID_MEMORY_BUDGET = 64 * 2**20
+_TILE_ELEMENT_BYTES = 40
+
+
+def _grid_tile_hits(a_start, a_end, n_start, n_end, memory_budget):
+    """
+    Yield (a_first, n_first, b_first, hit, c) for every broadcast (a, n, b) tile of the grid,
+    hit being the tile's solution mask, with tiles sized to fit memory_budget bytes
+    """
+    budget = max(1, memory_budget // _TILE_ELEMENT_BYTES)
+    n_count = n_end - n_start + 1
+
+    a_block = a_start
+    while a_block <= a_end:
+        # b only needs to span the feasible windows of this block of rows
+        b_low = feasible_b_window(a_block, (a_block + n_start) ** 3 - a_block ** 3)[0]
+        b_span = max(1, a_end - b_low)
+        b_tile = min(b_span, budget)
+        n_tile = min(n_count, max(1, budget // b_tile))
+        a_tile = max(1, budget // (n_tile * b_tile))
+        a_top = min(a_end, a_block + a_tile - 1)
+        b_high = a_top - 1
+
+        a = np.arange(a_block, a_top + 1, dtype=np.int64)[:, None, None]
+        for n_first in range(n_start, n_end + 1, n_tile):
+            n = np.arange(n_first, min(n_end, n_first + n_tile - 1) + 1, dtype=np.int64)[None, :, None]
+            target = (a + n) ** 3 - a ** 3
+            for b_first in range(b_low, b_high + 1, b_tile):
+                b = np.arange(b_first, min(b_high, b_first + b_tile - 1) + 1, dtype=np.int64)[None, None, :]
+                remainder = target - b * b * b
+                c = np.rint(np.cbrt(np.maximum(remainder, 0))).astype(np.int64)
+                hit = (b < a) & (c >= 1) & (c < b) & (c * c * c == remainder)
+                yield a_block, n_first, b_first, hit, c
+        a_block = a_top + 1
+
+
+def grid_quadruplets_vectorized(a_start, a_end, n_start, n_end, memory_budget=GRID_MEMORY_BUDGET):
+    """
+    Solutions of every (a, n) cell of a range grid, evaluated as broadcast (a, n, b) tiles
+    sized to fit memory_budget bytes. Returns {(a, n): [(a, b, c, d), ...]} in a-major
+    order with b descending inside each cell, like grid_quadruplets().
+    """
+    if grid_dtype(a_end, n_end) is object:
+        raise ValueError("grid_quadruplets_vectorized() needs every d³ of the grid below 2^63")
+    hits = []
+    for a_first, n_first, b_first, hit, c in _grid_tile_hits(a_start, a_end, n_start, n_end, memory_budget):
+        ia, i_n, ib = np.nonzero(hit)
+        hits.extend(zip((a_first + ia).tolist(), (n_first + i_n).tolist(), (b_first + ib).tolist(),
+                        c[ia, i_n, ib].tolist()))
+
+    cells = {}
+    for a, n, b, c in sorted(hits, key=lambda hit: (hit[0], hit[1], -hit[2])):
+        cells.setdefault((a, n), []).append((a, b, c, a + n))
+    return cells
+
+
+RANGE_SEARCH_ENGINES = {
+    "index": "sorted b³ + c³ index probe",
+    "vector": "vectorized (a, n, b) tiles (NumPy)",
+    "sweep": "per-a sweep over n against ascending b³ + c³",
+    "diagonal": "d-major two-pointer passes over a shared cube table",
+    "scan": "per-cell search",
+}
+
+
+def range_search_engine(method, a_end, n_end, cell_count):
+    """
+    Engine for a range grid: the index and vector engines need int64 targets (the sweep and
+    diagonal engines are exact at any size); "auto" picks the index when the grid has at
+    least a_end cells and the index stays small. The index holds ~a_end² / 2 rows, so past
+    INDEX_AUTO_MAX_B an explicit "index" runs on the memory-bounded vector tiles instead.
+    """
+    if method in ("sweep", "diagonal"):
+        return method
+    if grid_dtype(a_end, n_end) is object:
+        return "scan"
+    if method == "index" and a_end > INDEX_AUTO_MAX_B:
+        return "vector"
+    if method in RANGE_SEARCH_ENGINES:
+        return method
+    if method == "auto" and a_end <= INDEX_AUTO_MAX_B and cell_count >= a_end:
+        return "index"
+    return "scan"
+
+
+def grid_solution_counts(a_start, a_end, n_start, n_end, method="auto", memory_budget=GRID_MEMORY_BUDGET):
+    """
+    Number of solutions of every (a, n) cell as an int32 array (rows follow a, columns n),
+    without building a tuple per solution. The index engine counts the representations
+    of each d³ - a³ with b < a, the vector engine sums its tile masks over b, and every
+    other method counts cell by cell with cell_pairs() (exact at any size, no iteration limit).
+    """
+    counts = np.zeros((a_end - a_start + 1, n_end - n_start + 1), dtype=np.int32)
+    engine = range_search_engine(method, a_end, n_end, counts.size)
+    if engine == "vector":
+        for a_first, n_first, _, hit, _ in _grid_tile_hits(a_start, a_end, n_start, n_end, memory_budget):
+            rows, columns, _ = hit.shape
+            counts[a_first - a_start:a_first - a_start + rows,
+                   n_first - n_start:n_first - n_start + columns] += hit.sum(axis=2, dtype=np.int32)
+        return counts
+
+    if engine == "index":
+        index = shared_index(a_end - 1)
+        a, n = grid_axes(a_start, a_end, n_start, n_end)
+        first, last = index.probe(((a + n) ** 3 - a ** 3).ravel())
+        cells = np.flatnonzero(last > first)
+        lengths = (last - first)[cells]
+        cell_of = np.repeat(cells, lengths)
+        # Position of every representation: first[cell] + 0 .. length - 1
+        positions = np.repeat(first[cells] - (np.cumsum(lengths) - lengths), lengths) + np.arange(cell_of.size)
+        valid = index.b[positions] < a_start + cell_of // counts.shape[1]
+        counts.ravel()[:] = np.bincount(cell_of[valid], minlength=counts.size)
+        return counts
+
+    must_search = classify_cells(a_start, a_end, n_start, n_end)
+    for row, column in zip(*np.nonzero(must_search)):
+        pairs, _, _ = cell_pairs(a_start + int(row), n_start + int(column))
+        counts[row, column] = len(pairs)
+    return counts
+
+
+def grid_solutions(engine, a_start, a_end, n_start, n_end):
+    """{(a, n): quadruplets} for the whole grid from one of the non-"scan" range engines"""
+    if engine == "index":
+        return grid_quadruplets(a_start, a_end, n_start, n_end, shared_index(a_end - 1))
+    if engine == "sweep":
+        cells = {}
+        for a in range(a_start, a_end + 1):
+            cells.update(sweep_row(a, n_start, n_end))
+        return cells
+    if engine == "diagonal":
+        return grid_quadruplets_diagonal(a_start, a_end, n_start, n_end)
+    return grid_quadruplets_vectorized(a_start, a_end, n_start, n_end)
@@ -0,0 +1,260 @@
+"""
+Exact integer cube arithmetic shared by the cube quadruplet search kernels
+"""
+from array import array
+from bisect import bisect_right
+from functools import lru_cache
+from math import gcd, isqrt
+try:
+    import gmpy2
+except ImportError:  # optional: the pure-Python integer paths below give identical results
+    gmpy2 = None
+
+
+def power_residue_table(modulus, k):
+    """Lookup table: table[r] is True when r is a k-th power residue modulo `modulus`"""
+    table = [False] * modulus
+    for x in range(modulus):
+        table[pow(x, k, modulus)] = True
+    return tuple(table)
+
+
+def _cube_residue_table(modulus):
+    """Lookup table: table[r] is True when r is a cube residue modulo `modulus`"""
+    return power_residue_table(modulus, 3)
+
+
+# 819 = 7·9·13 and 703 = 19·37 only admit 45/819 and 91/703 cube residues,
+# so together the two tables reject ~99.3% of non-cubes.
+CUBE_RESIDUES_819 = _cube_residue_table(819)
+CUBE_RESIDUES_703 = _cube_residue_table(703)
+
+# Below this bit length a float estimate is within ±1 of the true root
+_FLOAT_GUESS_BITS = 150
+# Below this bit length `n ** (1/3)` does not overflow a float
+_FLOAT_RANGE_BITS = 1000
+
+BIG_INTEGER_BACKEND = "gmpy2" if gmpy2 is not None else "python"
+# From this bit length integer roots go through gmpy2 when it is installed; gcds stay on
+# math.gcd, which gmpy2 only beats past ~2048 bits. benchmark_big_integers.py measures
+# the crossover of each operation on the machine at hand
+GMPY2_ROOT_MIN_BITS = 64
+
+
+def icbrt(n):
+    """
+    Exact integer cube root: the largest x with x³ <= n (n >= 0)
+    """
+    if n < 0:
+        raise ValueError("icbrt() requires a non-negative integer")
+    if gmpy2 is not None and n.bit_length() >= GMPY2_ROOT_MIN_BITS:
+        return int(gmpy2.iroot(n, 3)[0])
+    return _icbrt_python(n)
+
+
+def _icbrt_python(n):
+    """icbrt() for n >= 0 in pure Python"""
+    if n < 2:
+        return n
+
+    bits = n.bit_length()
+    if bits <= _FLOAT_GUESS_BITS:
+        x = int(round(n ** (1.0 / 3.0)))
+        while x * x * x > n:
+            x -= 1
+        while (x + 1) * (x + 1) * (x + 1) <= n:
+            x += 1
+        return x
+
+    # Newton's iteration converges monotonically from any upper bound
+    if bits <= _FLOAT_RANGE_BITS:
+        x = int(n ** (1.0 / 3.0) * (1 + 1e-12)) + 1
+    else:
+        x = 1 << -(-bits // 3)
+    while True:
+        y = (2 * x + n // (x * x)) // 3
+        if y >= x:
+            return x
+        x = y
+
+
+def iroot(n, k):
+    """Exact integer k-th root: the largest x with x**k <= n (n >= 0, k >= 1)"""
+    if n < 0:
+        raise ValueError("iroot() requires a non-negative integer")
+    if k == 3:
+        return icbrt(n)
+    if n < 2 or k == 1:
+        return n
+    if gmpy2 is not None and n.bit_length() >= GMPY2_ROOT_MIN_BITS:
+        return int(gmpy2.iroot(n, k)[0])
+
+    # Newton's iteration converges monotonically from any upper bound
+    bits = n.bit_length()
+    if bits <= _FLOAT_RANGE_BITS:
+        x = int(n ** (1.0 / k) * (1 + 1e-12)) + 1
+    else:
+        x = 1 << -(-bits // k)
+    while True:
+        y = ((k - 1) * x + n // x ** (k - 1)) // k
+        if y >= x:
+            return x
+        x = y
+
+
+def exact_cube_root(n):
+    """
+    Return c with c³ == n, or None when n is not a perfect cube.
+    Residue tables mod 819 and 703 reject most candidates before any root is taken.
+    """
+    if n < 0:
+        root = exact_cube_root(-n)
+        return None if root is None else -root
+    if not CUBE_RESIDUES_819[n % 819] or not CUBE_RESIDUES_703[n % 703]:
+        return None
+    if gmpy2 is not None and n.bit_length() >= GMPY2_ROOT_MIN_BITS:
+        root, exact = gmpy2.iroot(n, 3)
+        return int(root) if exact else None
+    root = _icbrt_python(n)
+    return root if root * root * root == n else None
+
+
+def exact_root(n, k):
+    """Return c with c**k == n (n >= 0), or None when n is not a k-th power"""
+    if k == 3:
+        return exact_cube_root(n)
+    root = iroot(n, k)
+    return root if root ** k == n else None
+
+
+def is_perfect_cube(n):
+    """Check if n is the cube of an integer"""
+    return exact_cube_root(n) is not None
+
+
+def gcd_of(*numbers):
+    """Greatest common divisor of all the numbers"""
+    return gcd(*numbers)
+
+
+def feasible_b_window(a, target_sum, exponent=3):
+    """
+    Exact window (b_low, b_high) of b values that can solve b³ + c³ = target_sum
+    (b^k + c^k for another exponent) with a > b > c > 0. The window is empty when b_low > b_high.
+    """
+    # c < b forces b³ > target_sum / 2, c >= 1 forces b³ <= target_sum - 1
+    b_low = iroot(max(target_sum, 0) // 2, exponent) + 1
+    b_high = min(a - 1, iroot(max(target_sum - 1, 0), exponent))
+    return b_low, b_high
+
+
+def window_size(b_low, b_high):
+    """Number of b values in a feasible window"""
+    return max(0, b_high - b_low + 1)
+
+
+# b can only solve b³ + c³ = T if T - b³ is a cube residue modulo each of these,
+# so for a fixed T only ~5% of the classes of b modulo 7·9·13·19 survive.
+WHEEL_MODULI = (7, 9, 13, 19)
+WHEEL_MODULUS = 7 * 9 * 13 * 19
+# Windows narrower than this are walked directly rather than through a wheel
+_WHEEL_MIN_WINDOW = 256
+
+
+def _allowed_b_residues(modulus):
+    """allowed[t] lists the b mod `modulus` for which t - b³ is a cube residue"""
+    is_cube = _cube_residue_table(modulus)
+    return tuple(
+        tuple(r for r in range(modulus) if is_cube[(t - r * r * r) % modulus])
+        for t in range(modulus)
+    )
+
+
+_WHEEL_ALLOWED = tuple(_allowed_b_residues(m) for m in WHEEL_MODULI)
+# CRT coefficients: e ≡ 1 modulo its own modulus and ≡ 0 modulo the others
+_WHEEL_CRT = tuple(
+    (WHEEL_MODULUS // m) * pow(WHEEL_MODULUS // m, -1, m) for m in WHEEL_MODULI
+)
+
+
+@lru_cache(maxsize=WHEEL_MODULUS)
+def residue_wheel(target_residue):
+    """
+    Sorted residues of b modulo WHEEL_MODULUS that can solve b³ + c³ = T
+    when T ≡ target_residue (mod WHEEL_MODULUS). Empty when no b can.
+    """
+    wheel = [0]
+    for allowed, m, crt in zip(_WHEEL_ALLOWED, WHEEL_MODULI, _WHEEL_CRT):
+        lifts = [r * crt for r in allowed[target_residue % m]]
+        wheel = [(w + lift) % WHEEL_MODULUS for w in wheel for lift in lifts]
+    wheel.sort()
+    return array('H', wheel)
+
+
+def wheel_candidates(target_sum, b_low, b_high):
+    """
+    Yield b from b_high down to b_low, skipping every residue class of b
+    that the wheel for target_sum rules out
+    """
+    if b_high - b_low < _WHEEL_MIN_WINDOW:
+        # Building a fresh wheel costs more than the residue prefilter in exact_cube_root
+        # would spend on a window this small
+        yield from range(b_high, b_low - 1, -1)
+        return
+
+    wheel = residue_wheel(target_sum % WHEEL_MODULUS)
+    if not wheel or b_low > b_high:
+        return
+
+    base, offset = divmod(b_high, WHEEL_MODULUS)
+    base *= WHEEL_MODULUS
+    index = bisect_right(wheel, offset) - 1
+    while True:
+        while index >= 0:
+            b = base + wheel[index]
+            if b < b_low:
+                return
+            yield b
+            index -= 1
+        base -= WHEEL_MODULUS
+        if base + WHEEL_MODULUS <= b_low:
+            return
+        index = len(wheel) - 1
+
+
+# The divisor engine pays for factoring d³ - a³ up front, which only beats
+# scanning the wheel once the feasible b window is at least this wide
+DIVISOR_ENGINE_MIN_WINDOW = 4096
+# ... and while d³ - a³ has at most this many bits: Pollard rho has no step bound, and
+# a hard 88-bit semiprime already takes it ~1.5 s, so bigger targets are scanned instead
+DIVISOR_ENGINE_MAX_BITS = 88
+
+
+def two_cube_pairs_from_divisors(target_sum, divisors):
+    """
+    All (b, c) with b > c > 0 and b³ + c³ = target_sum, b descending.
+    Every solution has s = b + c dividing target_sum with s³/4 <= target_sum < s³,
+    so only those divisors are tried; each gives one quadratic for b and c.
+    """
+    pairs = []
+    for s in divisors:
+        s_cubed = s * s * s
+        if not target_sum < s_cubed <= 4 * target_sum or target_sum % s:
+            continue
+        # b³ + c³ = s·(s² - 3bc), so bc is fixed by s
+        three_bc = s * s - target_sum // s
+        if three_bc % 3:
+            continue
+        # (b - c)² = s² - 4bc
+        difference_squared = s * s - 4 * (three_bc // 3)
+        difference = isqrt(difference_squared)
+        if difference == 0 or difference * difference != difference_squared or (s + difference) % 2:
+            continue
+        pairs.append(((s + difference) // 2, (s - difference) // 2))
+    pairs.sort(reverse=True)
+    return pairs
+
+
+def divisor_search_bounds(target_sum):
+    """Range (low, high) that s = b + c must lie in for b³ + c³ = target_sum"""
+    return icbrt(target_sum) + 1, icbrt(4 * target_sum)
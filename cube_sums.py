@@ -0,0 +1,460 @@
+"""
+Two-cube sums b³ + c³ and the whole-range enumerators built on them
+"""
+import heapq
+import math
+import os
+import numpy as np
+from cube_grid import INT64_LIMIT, grid_axes, grid_dtype
+from cube_math import icbrt, iroot
+from factorization import divisors_in_range, factorize
+
+# Largest d whose targets still fit int64 (the sums table grows as d_max² / 2)
+ENUMERATION_MAX_D = int((INT64_LIMIT // 2) ** (1 / 3)) - 1
+# Range searches only build an index on their own while it stays below ~150 MB
+INDEX_AUTO_MAX_B = 4096
+
+_INDEX_FILES = ('sums.npy', 'b.npy', 'c.npy')
+
+
+def _largest_base(exponent):
+    """Largest x with 2·x^k below 2^63: the bound on b_max (or d) for int64 sums of that exponent"""
+    return ENUMERATION_MAX_D if exponent == 3 else iroot((INT64_LIMIT - 1) // 2, exponent)
+
+
+def _two_cube_rows(b_min, b_max, exponent=3):
+    """Unsorted (sums, b, c) for every b_max >= b >= b_min and b > c >= 1 (b^k + c^k for another exponent)"""
+    b_min = max(b_min, 2)
+    if b_max < b_min:
+        empty = np.empty(0, dtype=np.int32)
+        return np.empty(0, dtype=np.int64), empty, empty
+
+    # Row b holds c = 1 .. b - 1
+    row_lengths = np.arange(b_min - 1, b_max, dtype=np.int64)
+    b = np.repeat(np.arange(b_min, b_max + 1, dtype=np.int32), row_lengths)
+    row_starts = np.repeat(np.cumsum(row_lengths) - row_lengths, row_lengths)
+    c = (np.arange(b.size, dtype=np.int64) - row_starts + 1).astype(np.int32)
+
+    cubes = np.arange(b_max + 1, dtype=np.int64) ** exponent
+    return cubes[b] + cubes[c], b, c
+
+
+def two_cube_sums(b_max, exponent=3):
+    """
+    Every b³ + c³ with b_max >= b > c >= 1, sorted ascending (ties by b descending).
+    Returns (sums, b, c) as parallel int64 / int32 / int32 arrays.
+    Another exponent k gives the sorted b^k + c^k (which must fit int64).
+    """
+    sums, b, c = _two_cube_rows(2, b_max, exponent)
+    order = np.lexsort((-b, sums))
+    return sums[order], b[order], c[order]
+
+
+class TwoCubeSumIndex:
+    """
+    Sorted b³ + c³ for b_max >= b > c >= 1 with (b, c) payload columns (b^k + c^k for
+    another exponent). Grows by merging in the new rows, and saves to / loads from .npy
+    files (memory-mapped on load) so large indexes are built once.
+    """
+
+    def __init__(self, b_max, sums, b, c, exponent=3):
+        self.b_max = b_max
+        self.sums = sums
+        self.b = b
+        self.c = c
+        self.exponent = exponent
+
+    @classmethod
+    def build(cls, b_max, exponent=3):
+        if 2 * b_max ** exponent >= INT64_LIMIT:
+            raise ValueError(f"TwoCubeSumIndex supports b_max up to {_largest_base(exponent):,}")
+        return cls(b_max, *two_cube_sums(b_max, exponent), exponent)
+
+    def __len__(self):
+        return self.sums.size
+
+    def grow(self, b_max):
+        """Extend the index to b_max by sorting only the new rows and merging them in"""
+        if b_max <= self.b_max:
+            return self
+        if 2 * b_max ** self.exponent >= INT64_LIMIT:
+            raise ValueError(f"TwoCubeSumIndex supports b_max up to {_largest_base(self.exponent):,}")
+        sums, b, c = _two_cube_rows(self.b_max + 1, b_max, self.exponent)
+        order = np.lexsort((-b, sums))
+        sums, b, c = sums[order], b[order], c[order]
+        # New rows have larger b, so they go ahead of equal old sums
+        positions = np.searchsorted(self.sums, sums, side='left')
+        self.sums = np.insert(self.sums, positions, sums)
+        self.b = np.insert(self.b, positions, b)
+        self.c = np.insert(self.c, positions, c)
+        self.b_max = b_max
+        return self
+
+    def probe(self, targets):
+        """
+        Batched lookup: for each target, the slice [first, last) of the index
+        holding its representations as b³ + c³
+        """
+        targets = np.asarray(targets, dtype=np.int64)
+        return (np.searchsorted(self.sums, targets, side='left'),
+                np.searchsorted(self.sums, targets, side='right'))
+
+    def collisions(self, limit=None):
+        """
+        Every sum with two or more representations, from one linear pass over equal adjacent
+        values: [(sum, [(b, c), ...]), ...] in increasing sum, b descending. Sums below
+        (b_max + 1)³ have all their representations in the index, so limit is capped there.
+        """
+        bound = (self.b_max + 1) ** self.exponent
+        limit = bound - 1 if limit is None else min(limit, bound - 1)
+        end = int(np.searchsorted(self.sums, limit, side='right'))
+        repeated = np.flatnonzero(self.sums[1:end] == self.sums[:end - 1]) if end > 1 else np.empty(0, dtype=np.int64)
+
+        collisions = []
+        for i in repeated:
+            i = int(i)
+            pair = (int(self.b[i + 1]), int(self.c[i + 1]))
+            if collisions and collisions[-1][0] == int(self.sums[i]):
+                collisions[-1][1].append(pair)
+            else:
+                collisions.append((int(self.sums[i]), [(int(self.b[i]), int(self.c[i])), pair]))
+        return collisions
+
+    def save(self, directory):
+        """Write the columns as .npy files into directory"""
+        os.makedirs(directory, exist_ok=True)
+        for name, column in zip(_INDEX_FILES, (self.sums, self.b, self.c)):
+            np.save(os.path.join(directory, name), column)
+
+    @classmethod
+    def load(cls, directory, mmap=True, exponent=3):
+        """Read an index written by save(), memory-mapped unless mmap is False"""
+        sums, b, c = (np.load(os.path.join(directory, name), mmap_mode='r' if mmap else None)
+                      for name in _INDEX_FILES)
+        return cls(int(b.max()) if b.size else 1, sums, b, c, exponent)
+
+
+_shared_indexes = {}
+
+
+def shared_index(b_max, exponent=3):
+    """Process-wide index (one per exponent) covering at least b_max, doubled in place when it is too small"""
+    index = _shared_indexes.get(exponent)
+    if index is None:
+        index = _shared_indexes[exponent] = TwoCubeSumIndex.build(b_max, exponent)
+    elif index.b_max < b_max:
+        index.grow(max(b_max, min(2 * index.b_max, INDEX_AUTO_MAX_B)))
+    return index
+
+
+def taxicab_cells(limit, index=None):
+    """
+    The (a, n) cells holding two or more quadruplets with d³ - a³ <= limit, found from the
+    sums the index represents in several ways: each such sum T is solved for every
+    d - a = n dividing T with n³ < T (3a² + 3an + n² = T / n), keeping representations
+    with b < a. Returns {(a, n): [(a, b, c, d), ...]} in a-major order, b descending.
+    """
+    if index is None:
+        index = shared_index(icbrt(limit))
+    cells = {}
+    for total, pairs in index.collisions(limit):
+        for n in divisors_in_range(factorize(total), 1, icbrt(total - 1)):
+            discriminant = 12 * (total // n) - 3 * n * n
+            root = math.isqrt(discriminant)
+            if root * root != discriminant or (root - 3 * n) % 6:
+                continue
+            a = (root - 3 * n) // 6
+            found = [(a, b, c, a + n) for b, c in pairs if b < a]
+            if a > 0 and len(found) > 1:
+                cells[(a, n)] = found
+    return {cell: cells[cell] for cell in sorted(cells)}
+
+
+def enumerate_quadruplets(d_max, index=None):
+    """
+    All (a, b, c, d) with a³ + b³ + c³ = d³, d > a > b > c > 0 and d <= d_max,
+    ordered by d, then a, then b descending.
+    Builds the two-cube sums once and matches every d³ - a³ against them.
+    """
+    if d_max > ENUMERATION_MAX_D:
+        raise ValueError(f"enumerate_quadruplets() supports d_max up to {ENUMERATION_MAX_D:,}")
+
+    # b < a < d forces b <= d_max - 2
+    if index is None:
+        index = TwoCubeSumIndex.build(d_max - 2)
+    a_cubes = np.arange(1, d_max, dtype=np.int64) ** 3
+
+    quadruplets = []
+    for d in range(3, d_max + 1):
+        first, last = index.probe(d ** 3 - a_cubes[:d - 1])
+        for i in np.flatnonzero(last > first):
+            a = int(i) + 1
+            for k in range(first[i], last[i]):
+                b = int(index.b[k])
+                if b < a:
+                    quadruplets.append((a, b, int(index.c[k]), d))
+    return quadruplets
+
+
+def grid_quadruplets(a_start, a_end, n_start, n_end, index):
+    """
+    Solutions of every (a, n) cell of a range grid from one batched probe of the index,
+    which must cover b <= a_end - 1; an index of another exponent k solves
+    a^k + b^k + c^k = d^k. Returns {(a, n): [(a, b, c, d), ...]} in a-major order with
+    b descending inside each cell; cells without solutions are left out.
+    """
+    k = index.exponent
+    if grid_dtype(a_end, n_end, k) is object:
+        raise ValueError(f"grid_quadruplets() supports a + n up to {_largest_base(k):,}")
+    a, n = grid_axes(a_start, a_end, n_start, n_end, k)
+    first, last = index.probe(((a + n) ** k - a ** k).ravel())
+
+    width = n_end - n_start + 1
+    cells = {}
+    for i in np.flatnonzero(last > first):
+        row, column = divmod(int(i), width)
+        a, n = a_start + row, n_start + column
+        for k in range(first[i], last[i]):
+            b = int(index.b[k])
+            if b < a:
+                cells.setdefault((a, n), []).append((a, b, int(index.c[k]), a + n))
+    return cells
+
+
+def _two_cube_sum_stream(low, high, b_max):
+    """Ascending (b³ + c³, b, c) with low <= b³ + c³ < high and b_max >= b > c >= 1, one heap entry per b"""
+    heap = []
+    for b in range(2, b_max + 1):
+        c = max(1, icbrt(max(low - b ** 3 - 1, 0)) + 1)
+        value = b ** 3 + c ** 3
+        if c < b and value < high:
+            heap.append((value, b, c))
+    heapq.heapify(heap)
+    while heap:
+        value, b, c = heap[0]
+        yield value, b, c
+        c += 1
+        value = b ** 3 + c ** 3
+        if c < b and value < high:
+            heapq.heapreplace(heap, (value, b, c))
+        else:
+            heapq.heappop(heap)
+
+
+def _cube_difference_stream(d_low, d_high):
+    """Ascending (d³ - a³, a, d) with d_low <= d <= d_high and 1 <= a < d, one heap entry per a"""
+    heap = [(max(a + 1, d_low) ** 3 - a ** 3, a, max(a + 1, d_low)) for a in range(1, d_high)]
+    heapq.heapify(heap)
+    while heap:
+        value, a, d = heap[0]
+        yield value, a, d
+        d += 1
+        if d <= d_high:
+            heapq.heapreplace(heap, (d ** 3 - a ** 3, a, d))
+        else:
+            heapq.heappop(heap)
+
+
+def sweep_row(a, n_start, n_end):
+    """
+    Solutions of the cells (a, n_start) .. (a, n_end) from one merge walk: the targets
+    (a + n)³ - a³ rise with n, so they are matched in order against the ascending
+    b³ + c³ with b < a (one heap entry per b). Both sides gallop: an entry below the
+    target jumps straight to the first c that reaches it, and n jumps straight to the
+    first target at or above the smallest entry. Exact for any size of a and n.
+    Returns {(a, n): [(a, b, c, d), ...]} with b descending in each cell.
+    """
+    a_cubed = a ** 3
+    target = (a + n_start) ** 3 - a_cubed
+    high = (a + n_end) ** 3 - a_cubed
+    heap = []
+    for b in range(2, a):
+        b_cubed = b ** 3
+        c = icbrt(max(target - b_cubed - 1, 0)) + 1
+        if c < b and b_cubed + c ** 3 <= high:
+            heap.append((b_cubed + c ** 3, b, c))
+    heapq.heapify(heap)
+
+    cells = {}
+    d = a + n_start
+    while heap:
+        value, b, c = heap[0]
+        if value > target:
+            # Targets strictly below the smallest sum cannot match
+            d = icbrt(value + a_cubed - 1) + 1
+            target = d ** 3 - a_cubed
+            continue
+        if value == target:
+            cells.setdefault((a, d - a), []).append((a, b, c, d))
+            c += 1
+        else:
+            c = icbrt(target - b ** 3 - 1) + 1
+        value = b ** 3 + c ** 3
+        if c < b and value <= high:
+            heapq.heapreplace(heap, (value, b, c))
+        else:
+            heapq.heappop(heap)
+
+    for found in cells.values():
+        found.sort(key=lambda q: -q[1])
+    return cells
+
+
+def diagonal_quadruplets(d, a_low, a_high, cubes):
+    """
+    All (a, b, c, d) with a³ + b³ + c³ = d³, a_low <= a <= a_high and a > b > c >= 1 for one
+    d, from a two-pointer pass per a over the shared table cubes[k] = k³ (which must reach
+    a_high - 1): b walks down from its largest feasible value while c walks up, so each
+    step is one table lookup and one comparison. Ordered by a, then b descending.
+    """
+    d_cubed = d ** 3
+    quadruplets = []
+    for a in range(a_low, a_high + 1):
+        target = d_cubed - cubes[a]
+        b = min(a - 1, icbrt(target))
+        c = max(1, icbrt(target - cubes[b]))
+        while c < b:
+            value = cubes[b] + cubes[c]
+            if value == target:
+                quadruplets.append((a, b, c, d))
+                b -= 1
+                c += 1
+            elif value > target:
+                b -= 1
+            else:
+                c += 1
+    return quadruplets
+
+
+def grid_quadruplets_diagonal(a_start, a_end, n_start, n_end):
+    """
+    Solutions of every (a, n) cell of a range grid, visited d-major: the cells on the
+    diagonal d = a + n share d³ and one cube table for the whole grid. Exact for any size.
+    Returns {(a, n): [(a, b, c, d), ...]} in a-major order with b descending in each cell.
+    """
+    cubes = [k ** 3 for k in range(a_end + 1)]
+    found = {}
+    for d in range(a_start + n_start, a_end + n_end + 1):
+        a_low, a_high = max(a_start, d - n_end), min(a_end, d - n_start)
+        for quadruplet in diagonal_quadruplets(d, a_low, a_high, cubes):
+            found.setdefault((quadruplet[0], d - quadruplet[0]), []).append(quadruplet)
+    return {cell: found[cell] for cell in sorted(found)}
+
+
+# Width of the first block of d an open-ended enumeration solves
+_FIRST_BLOCK_WIDTH = 64
+
+
+def _block_quadruplets(d_low, d_high):
+    """Quadruplets with d_low <= d <= d_high, found by merging the two ascending streams"""
+    low = d_low ** 3 - (d_low - 1) ** 3
+    sums = _two_cube_sum_stream(low, d_high ** 3, d_high - 2)
+    differences = _cube_difference_stream(d_low, d_high)
+    found = []
+    pair = next(sums, None)
+    difference = next(differences, None)
+    while pair is not None and difference is not None:
+        if pair[0] < difference[0]:
+            pair = next(sums, None)
+        elif difference[0] < pair[0]:
+            difference = next(differences, None)
+        else:
+            # Every representation of this value on either side is a candidate
+            value = pair[0]
+            pairs, differences_at_value = [], []
+            while pair is not None and pair[0] == value:
+                pairs.append(pair)
+                pair = next(sums, None)
+            while difference is not None and difference[0] == value:
+                differences_at_value.append(difference)
+                difference = next(differences, None)
+            found.extend((a, b, c, d) for _, a, d in differences_at_value for _, b, c in pairs if b < a)
+    found.sort(key=lambda q: (q[3], q[0], -q[1]))
+    return found
+
+
+def iter_quadruplets(d_min=3, d_max=None):
+    """
+    Lazily yield every (a, b, c, d) with a³ + b³ + c³ = d³ and d > a > b > c > 0,
+    in increasing d, then a, then b descending. Runs forever when d_max is None.
+
+    Each block of d is solved by a Bernstein-style merge of two heap-ordered streams,
+    b³ + c³ and d³ - a³, so memory stays O(d) rather than the O(d²) of a sums table.
+    A block streams every b³ + c³ below its d_high³ however narrow it is, so blocks start
+    _FIRST_BLOCK_WIDTH wide (the first solutions arrive quickly at any d_min) and double,
+    keeping the total work within a constant factor of one pass.
+    """
+    d_low = max(d_min, 3)
+    width = _FIRST_BLOCK_WIDTH
+    while d_max is None or d_low <= d_max:
+        d_high = d_low + width - 1 if d_max is None else min(d_max, d_low + width - 1)
+        yield from _block_quadruplets(d_low, d_high)
+        d_low = d_high + 1
+        width *= 2
+
+
+# Sums hashed per batch while a filter is built
+_FILTER_BATCH = 1 << 20
+_LN2 = math.log(2)
+
+
+def _splitmix64(values):
+    """Well-mixed 64-bit hashes of an int64 array (wrapping uint64 arithmetic)"""
+    z = values.astype(np.uint64) + np.uint64(0x9E3779B97F4A7C15)
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return z ^ (z >> np.uint64(31))
+
+
+class TwoCubeSumFilter:
+    """
+    Bloom filter over every b³ + c³ with b_max >= b > c >= 1, for bounds where the
+    exact index does not fit in memory. contains() never rejects a true sum and
+    accepts a non-sum with probability false_positive_rate.
+    Size it by false_positive_rate, or fix memory_bytes and read the rate back.
+    """
+
+    def __init__(self, b_max, false_positive_rate=0.01, memory_bytes=None):
+        if 2 * b_max ** 3 >= INT64_LIMIT:
+            raise ValueError(f"TwoCubeSumFilter supports b_max up to {ENUMERATION_MAX_D:,}")
+        self.b_max = b_max
+        self.count = max(b_max * (b_max - 1) // 2, 1)
+        if memory_bytes is None:
+            bit_count = -self.count * math.log(false_positive_rate) / _LN2 ** 2
+        else:
+            bit_count = 8 * memory_bytes
+        self.bit_count = max(64, int(bit_count))
+        self.hash_count = max(1, round(self.bit_count / self.count * _LN2))
+        self.bits = np.zeros((self.bit_count + 7) // 8, dtype=np.uint8)
+
+        rows_per_batch = max(1, _FILTER_BATCH // max(b_max, 1))
+        for b_low in range(2, b_max + 1, rows_per_batch):
+            sums, _, _ = _two_cube_rows(b_low, min(b_max, b_low + rows_per_batch - 1))
+            for position in self._positions(sums):
+                np.bitwise_or.at(self.bits, position >> np.uint64(3),
+                                 np.left_shift(1, position & np.uint64(7)).astype(np.uint8))
+
+    def _positions(self, values):
+        """Bit positions of each hash function, by double hashing"""
+        h = _splitmix64(np.asarray(values, dtype=np.int64))
+        step = (h >> np.uint64(32)) | np.uint64(1)
+        size = np.uint64(self.bit_count)
+        for i in range(self.hash_count):
+            yield (h + np.uint64(i) * step) % size
+
+    def contains(self, values):
+        """Boolean array: False where a value is certainly not b³ + c³ with b <= b_max"""
+        values = np.asarray(values, dtype=np.int64)
+        found = np.ones(values.shape, dtype=bool)
+        for position in self._positions(values):
+            found &= (self.bits[position >> np.uint64(3)] >> (position & np.uint64(7)).astype(np.uint8)) & 1 == 1
+        return found
+
+    @property
+    def memory_bytes(self):
+        return self.bits.nbytes
+
+    @property
+    def false_positive_rate(self):
+        """Expected rate at which contains() accepts a value that is not a sum"""
+        return (1 - math.exp(-self.hash_count * self.count / self.bit_count)) ** self.hash_count
@@ -0,0 +1,273 @@
+"""
+Integer factorization helpers for the divisor-based cube quadruplet search
+"""
+from functools import lru_cache
+from math import gcd, isqrt
+from random import Random
+
+
+def _primes_below(limit):
+    """Primes p < limit by the sieve of Eratosthenes"""
+    sieve = bytearray([1]) * limit
+    sieve[:2] = b"\x00\x00"
+    for p in range(2, isqrt(limit - 1) + 1):
+        if sieve[p]:
+            sieve[p * p::p] = bytes(len(range(p * p, limit, p)))
+    return tuple(p for p in range(limit) if sieve[p])
+
+
+# Trial division removes every prime below this bound before Miller–Rabin / rho run
+TRIAL_DIVISION_LIMIT = 1000
+SMALL_PRIMES = _primes_below(TRIAL_DIVISION_LIMIT)
+
+# The first 13 prime bases make Miller–Rabin deterministic below 3.3·10^24;
+# above that a composite passes all of them with probability below 4^-13
+_MILLER_RABIN_BASES = SMALL_PRIMES[:13]
+
+# Range grids repeat n (and often 3a² + 3an + n²) across many cells
+FACTOR_CACHE_SIZE = 65536
+
+_rho_random = Random(0x5EED)
+
+
+def is_probable_prime(n):
+    """Miller–Rabin primality test, exact for n < 3.3·10^24"""
+    if n < 2:
+        return False
+    for p in _MILLER_RABIN_BASES:
+        if n % p == 0:
+            return n == p
+    d, s = n - 1, 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+    for base in _MILLER_RABIN_BASES:
+        x = pow(base, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def _pollard_brent(n):
+    """A non-trivial factor of the odd composite n (Brent's variant of Pollard rho)"""
+    while True:
+        y = _rho_random.randrange(1, n)
+        c = _rho_random.randrange(1, n)
+        m = 128
+        g = r = q = 1
+        while g == 1:
+            x = y
+            for _ in range(r):
+                y = (y * y + c) % n
+            k = 0
+            while k < r and g == 1:
+                saved = y
+                for _ in range(min(m, r - k)):
+                    y = (y * y + c) % n
+                    q = q * abs(x - y) % n
+                g = gcd(q, n)
+                k += m
+            r *= 2
+        if g == n:
+            # The batched product overshot; replay the last block one step at a time
+            g = 1
+            while g == 1:
+                saved = (saved * saved + c) % n
+                g = gcd(abs(x - saved), n)
+        if g != n:
+            return g
+
+
+def _large_prime_factors(n, factors):
+    """Add the prime factors of n (no prime factor below TRIAL_DIVISION_LIMIT) to factors"""
+    if n == 1:
+        return
+    if n < TRIAL_DIVISION_LIMIT * TRIAL_DIVISION_LIMIT or is_probable_prime(n):
+        factors[n] = factors.get(n, 0) + 1
+        return
+    root = isqrt(n)
+    if root * root == n:
+        for _ in range(2):
+            _large_prime_factors(root, factors)
+        return
+    divisor = _pollard_brent(n)
+    _large_prime_factors(divisor, factors)
+    _large_prime_factors(n // divisor, factors)
+
+
+@lru_cache(maxsize=FACTOR_CACHE_SIZE)
+def _cached_factorization(n):
+    """Sorted ((prime, exponent), ...) for n >= 1, memoized"""
+    factors = {}
+    for p in SMALL_PRIMES:
+        if p * p > n:
+            break
+        if n % p == 0:
+            exponent = 0
+            while n % p == 0:
+                n //= p
+                exponent += 1
+            factors[p] = exponent
+    if n < TRIAL_DIVISION_LIMIT * TRIAL_DIVISION_LIMIT:
+        if n > 1:
+            factors[n] = factors.get(n, 0) + 1
+    else:
+        _large_prime_factors(n, factors)
+    return tuple(sorted(factors.items()))
+
+
+def factorize(n):
+    """Prime factorization of n >= 1 as a {prime: exponent} dict"""
+    if n < 1:
+        raise ValueError("factorize() requires a positive integer")
+    return dict(_cached_factorization(n))
+
+
+def factorization_cache_info():
+    """Hit/miss statistics of the factorization memo"""
+    return _cached_factorization.cache_info()
+
+
+def merge_factorizations(*factorizations):
+    """Factorization of the product of the given factorizations"""
+    merged = {}
+    for factors in factorizations:
+        for p, e in factors.items():
+            merged[p] = merged.get(p, 0) + e
+    return merged
+
+
+def target_factorization(a, n):
+    """Factorization of d³ - a³ = n·(3a² + 3an + n²) where d = a + n"""
+    return merge_factorizations(factorize(n), factorize(3 * a * a + 3 * a * n + n * n))
+
+
+# Primes up to this bound are sieved out of 3a² + 3an + n²; larger cofactors are factored directly
+SIEVE_PRIME_LIMIT = 1 << 16
+# Cofactors held at once by a sieve segment
+SIEVE_SEGMENT_SIZE = 4096
+# Sieved factorizations a TargetFactorizationCache holds at once, over all of its n columns
+SIEVE_HELD_FACTORIZATIONS = 1 << 20
+
+
+@lru_cache(maxsize=None)
+def _cofactor_sieve_roots(limit):
+    """
+    (p, ρ1, ρ2) for every prime 3 < p < limit with p ≡ 1 (mod 3): 3a² + 3an + n² ≡ 0 (mod p)
+    exactly when a ≡ ρ1·n or a ≡ ρ2·n. Primes p ≡ 2 (mod 3) only divide it when p | n.
+    """
+    roots = []
+    for p in _primes_below(limit):
+        if p % 3 != 1:
+            continue
+        # A primitive cube root of unity ω gives √-3 = 2ω + 1
+        g = 2
+        while pow(g, (p - 1) // 3, p) == 1:
+            g += 1
+        omega = pow(g, (p - 1) // 3, p)
+        inverse_3 = pow(3, -1, p)
+        roots.append((p, (omega - 1) * inverse_3 % p, -(omega + 2) * inverse_3 % p))
+    return tuple(roots)
+
+
+def _sieve_cofactor_segment(n, a_start, a_end, n_factors, prime_limit):
+    """Factorizations of 3a² + 3an + n² for a_start <= a <= a_end, sieved by the roots mod p"""
+    length = a_end - a_start + 1
+    cofactors = [3 * a * a + 3 * a * n + n * n for a in range(a_start, a_end + 1)]
+    factors = [{} for _ in range(length)]
+
+    def divide_out(p, root):
+        for i in range((root - a_start) % p, length, p):
+            exponent = 0
+            while cofactors[i] % p == 0:
+                cofactors[i] //= p
+                exponent += 1
+            factors[i][p] = exponent
+
+    # p = 2, 3 and the primes of n have roots that do not follow the ρ·n pattern
+    special = {2, 3} | {p for p in n_factors if p < prime_limit}
+    for p in special:
+        for root in range(p) if p <= 3 else (0,):
+            if (3 * root * root + 3 * root * n + n * n) % p == 0:
+                divide_out(p, root)
+    for p, rho1, rho2 in _cofactor_sieve_roots(prime_limit):
+        if p not in special:
+            divide_out(p, rho1 * n % p)
+            divide_out(p, rho2 * n % p)
+
+    for i, cofactor in enumerate(cofactors):
+        if cofactor == 1:
+            continue
+        if cofactor < prime_limit * prime_limit:
+            factors[i][cofactor] = factors[i].get(cofactor, 0) + 1
+        else:
+            factors[i] = merge_factorizations(factors[i], factorize(cofactor))
+    return factors
+
+
+def _sieve_prime_limit(n, a_end):
+    """Bound on the primes sieved out of 3a² + 3an + n² for a <= a_end"""
+    largest_cofactor = 3 * a_end * a_end + 3 * a_end * n + n * n
+    return min(SIEVE_PRIME_LIMIT, isqrt(largest_cofactor) + 2)
+
+
+def iter_target_factorizations(n, a_start, a_end, segment_size=SIEVE_SEGMENT_SIZE):
+    """
+    Yield (a, factorization of d³ - a³) for every a in [a_start, a_end] with d = a + n.
+    The cofactor 3a² + 3an + n² is sieved for a whole segment of a values at once,
+    so only segment_size cofactors are held in memory.
+    """
+    n_factors = factorize(n)
+    prime_limit = _sieve_prime_limit(n, a_end)
+    for segment_start in range(a_start, a_end + 1, segment_size):
+        segment_end = min(a_end, segment_start + segment_size - 1)
+        segment = _sieve_cofactor_segment(n, segment_start, segment_end, n_factors, prime_limit)
+        for a, cofactor_factors in zip(range(segment_start, segment_end + 1), segment):
+            yield a, merge_factorizations(n_factors, cofactor_factors)
+
+
+class TargetFactorizationCache:
+    """
+    Factorizations of d³ - a³ for the cells of an a-major sweep over a <= a_end and
+    `columns` values of n. A column is sieved lazily, one run of a values at a time, when
+    one of its cells is first asked for. Each segment loops over the whole prime table, so a
+    run shorter than that table (few rows left, or too many columns to hold) is not sieved
+    and its cells are factored one by one.
+    """
+
+    def __init__(self, a_end, columns, segment_size=SIEVE_SEGMENT_SIZE, max_held=SIEVE_HELD_FACTORIZATIONS):
+        self.a_end = a_end
+        self.run_length = max(1, min(segment_size, max_held // max(1, columns)))
+        self._runs = {}
+
+    def factors(self, a, n):
+        """Factorization of d³ - a³ with d = a + n"""
+        run = self._runs.get(n)
+        if run is None or a not in run:
+            run_end = min(self.a_end, a + self.run_length - 1)
+            if run_end - a + 1 < len(_cofactor_sieve_roots(_sieve_prime_limit(n, run_end))):
+                self._runs.pop(n, None)
+                return target_factorization(a, n)
+            run = self._runs[n] = dict(iter_target_factorizations(n, a, run_end, self.run_length))
+        return run.pop(a)
+
+
+def divisors_in_range(factors, low, high):
+    """Sorted divisors s of the factored number with low <= s <= high"""
+    divisors = [1]
+    for p, e in factors.items():
+        extended = []
+        for divisor in divisors:
+            for _ in range(e + 1):
+                if divisor > high:
+                    break
+                extended.append(divisor)
+                divisor *= p
+        divisors = extended
+    return sorted(s for s in divisors if s >= low)
@@ -0,0 +1,42 @@
+"""
+Exponent-generic search: a^k + b^k + c^k = d^k with d = a + n, d > a > b > c > 0.
+The cube machinery takes the exponent: the b window, the vectorized window kernel with
+its residue filters and the sorted two-power-sum index; k = 3 is the cube search itself.
+"""
+from cube_grid import INT64_LIMIT
+from cube_kernels import grid_solutions, range_search_engine, window_pairs_vectorized
+from cube_math import feasible_b_window
+from cube_sums import INDEX_AUTO_MAX_B, grid_quadruplets, shared_index
+
+
+def power_cell_solutions(a, n, k, max_count=None):
+    """Solutions (a, b, c, d) of the cell (a, n) for exponent k, b descending, and b values examined"""
+    d = a + n
+    target_sum = d ** k - a ** k
+    b_low, b_high = feasible_b_window(a, target_sum, k)
+    pairs, examined = window_pairs_vectorized(target_sum, b_low, b_high, max_count, exponent=k)
+    return [(a, b, c, d) for b, c in pairs], examined
+
+
+def power_grid_solutions(a_start, a_end, n_start, n_end, k):
+    """
+    {(a, n): [(a, b, c, d), ...]} for every cell of a range grid and exponent k, in a-major
+    order with b descending. While every d^k fits int64 and b^k + c^k for b < a_end stays
+    small enough to tabulate, all targets are probed at once against the sorted sums;
+    otherwise each cell's window is searched on its own.
+    """
+    cell_count = (a_end - a_start + 1) * (n_end - n_start + 1)
+    if k == 3:
+        engine = range_search_engine("auto", a_end, n_end, cell_count)
+        if engine != "scan":
+            return grid_solutions(engine, a_start, a_end, n_start, n_end)
+    elif 2 * (a_end + n_end) ** k < INT64_LIMIT and a_end <= INDEX_AUTO_MAX_B:
+        return grid_quadruplets(a_start, a_end, n_start, n_end, shared_index(a_end - 1, k))
+
+    cells = {}
+    for a_value in range(a_start, a_end + 1):
+        for n_value in range(n_start, n_end + 1):
+            found, _ = power_cell_solutions(a_value, n_value, k)
+            if found:
+                cells[(a_value, n_value)] = found
+    return cells
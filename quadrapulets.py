@@ -3,11 +3,21 @@ def find_cube_quadruplets(a, n):
     target = d**3 - a**3
     results = []
 
-    # Try all possible b and c such that b^3 + c^3 = target
-    for b in range(a - 1, 1, -1):
-        for c in range(b - 1, 0, -1):
-            if b**3 + c**3 == target:
-                results.append((a, b, c, d))
+    # Two pointers over monotone cubes: b walks down from a - 1, c walks up from 1.
+    # b³ + c³ too large means b is too large for every remaining c, too small
+    # means c is too small for every remaining b, so each step discards one value.
+    b, c = a - 1, 1
+    b_cubed, c_cubed = b**3, 1
+    while c < b:
+        pair_sum = b_cubed + c_cubed
+        if pair_sum == target:
+            results.append((a, b, c, d))
+        if pair_sum >= target:
+            b -= 1
+            b_cubed = b**3
+        else:
+            c += 1
+            c_cubed = c**3
 
     return results
 